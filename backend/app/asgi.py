@@ -0,0 +1,84 @@
+"""
+Minimal in-process ASGI client: drives the app without sockets or extra dependencies
+
+Used by the snapshot export and the load-testing suite.
+"""
+import asyncio
+from typing import Iterable, Optional, Tuple
+from urllib.parse import urlencode
+
+# Ключ scope, которым помечены запросы самого приложения (рендер снимка)
+INTERNAL_SCOPE_KEY = "app.internal"
+
+
+def is_internal(scope) -> bool:
+    """Whether the request was sent in-process by an internal ``ASGIClient``"""
+    return scope.get(INTERNAL_SCOPE_KEY, False)
+
+
+class ASGIClient:
+    """
+    Send HTTP requests straight into an ASGI application
+
+    With ``internal=True`` requests are marked as the application's own
+    (``is_internal``), so per-client limits do not apply to them.
+    """
+
+    def __init__(self, app, internal: bool = False):
+        self.app = app
+        self.internal = internal
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        params: Optional[dict] = None,
+        body: bytes = b"",
+        headers: Iterable[Tuple[str, str]] = (),
+    ) -> Tuple[int, bytes]:
+        """Return (status code, response body)"""
+        query = urlencode(params or {}, doseq=True)
+        raw_headers = [(b"host", b"localhost")]
+        raw_headers += [(name.lower().encode(), value.encode()) for name, value in headers]
+        if body:
+            raw_headers.append((b"content-length", str(len(body)).encode()))
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": query.encode(),
+            "root_path": "",
+            "headers": raw_headers,
+            "client": ("127.0.0.1", 50000),
+            "server": ("localhost", 80),
+            INTERNAL_SCOPE_KEY: self.internal,
+        }
+
+        request_sent = False
+        response_done = asyncio.Event()
+        status = 0
+        chunks = []
+
+        async def receive():
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            await response_done.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    response_done.set()
+
+        await self.app(scope, receive, send)
+        return status, b"".join(chunks)
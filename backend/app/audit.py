@@ -0,0 +1,199 @@
+"""
+Append-only change log of project writes
+
+The write endpoints call ``audit_log.created/updated/deleted`` after a write;
+these only queue the event. A background task inserts queued events into
+``project_changes`` with one bulk insert per batch, every
+``AUDIT_FLUSH_INTERVAL`` seconds or as soon as ``AUDIT_BATCH_SIZE`` events
+are waiting, so a write never waits for the log. While the database is
+unavailable events stay queued (up to ``AUDIT_MAX_PENDING``, older ones are
+dropped) and are retried on the next flush.
+
+``GET /api/changes?since=<id>`` returns the log in id order for incremental
+sync. The feed pages on the id, so a row must never become visible after a
+row with a larger id: on PostgreSQL the batches of all workers are inserted
+one at a time under an advisory lock held until commit, and ids are assigned
+in commit order. SQLite allows a single writer anyway.
+"""
+import asyncio
+import logging
+from collections import deque
+from datetime import date, datetime, timezone
+from enum import Enum
+from typing import Any, Deque, Dict, Optional
+
+from tortoise.transactions import in_transaction
+
+from app.config import settings
+from app.metrics import audit_events
+from app.models import ChangeOperation, ProjectChange
+
+logger = logging.getLogger(__name__)
+
+# Ключ pg_advisory_xact_lock, под которым воркеры вставляют пакеты журнала
+FEED_LOCK_KEY = 0x61756469  # "audi"
+
+# Поля, которые меняют записи API; media заполняет конвейер картинок, в журнал не попадает
+AUDITED_FIELDS = (
+    "title",
+    "title_en",
+    "category",
+    "status",
+    "year",
+    "image",
+    "description",
+    "description_en",
+    "client",
+    "role",
+    "images",
+)
+
+
+def _plain(value: Any) -> Any:
+    """JSON-compatible form of a field value"""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def project_values(project: Any) -> Dict[str, Any]:
+    """Audited field values of a project model or a ``.values()`` row"""
+    get = project.get if isinstance(project, dict) else lambda name: getattr(project, name)
+    return {name: _plain(get(name)) for name in AUDITED_FIELDS}
+
+
+class AuditLog:
+    """Queue of change events flushed to ``project_changes`` by a background task"""
+
+    def __init__(self, batch_size: int = 500, flush_interval: float = 1.0, max_pending: int = 10000):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.written = 0
+        self.dropped = 0
+        self._pending: Deque[ProjectChange] = deque()
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._stopping = False
+
+    @property
+    def enabled(self) -> bool:
+        return settings.AUDIT_ENABLED
+
+    def record(self, project_id: int, operation: ChangeOperation, changes: Dict[str, list]) -> None:
+        """Queue one event; never blocks"""
+        if not self.enabled:
+            return
+        self._pending.append(ProjectChange(
+            project_id=project_id,
+            operation=operation,
+            changes=changes,
+            created_at=datetime.now(timezone.utc),
+        ))
+        self._trim()
+        if len(self._pending) >= self.batch_size and self._wakeup is not None:
+            self._wakeup.set()
+
+    def created(self, project_id: int, values: Dict[str, Any]) -> None:
+        self.record(project_id, ChangeOperation.CREATE, {name: [None, value] for name, value in values.items()})
+
+    def updated(self, project_id: int, old: Dict[str, Any], new: Dict[str, Any]) -> None:
+        """Queue the changed fields only; an update that changed nothing is not logged"""
+        changes = {name: [old.get(name), value] for name, value in new.items() if old.get(name) != value}
+        if changes:
+            self.record(project_id, ChangeOperation.UPDATE, changes)
+
+    def deleted(self, project_id: int, values: Dict[str, Any]) -> None:
+        self.record(project_id, ChangeOperation.DELETE, {name: [value, None] for name, value in values.items()})
+
+    async def start(self) -> None:
+        """Start flushing in the background"""
+        if not self.enabled:
+            return
+        self._wakeup = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._stopping = False
+        self._task = asyncio.create_task(self._flush_forever())
+
+    async def stop(self) -> None:
+        """Stop the background task and write what is still queued"""
+        if self._task is None:
+            return
+        # Без cancel(): отмена посреди bulk_create оставляет транзакцию открытой,
+        # и следующая вставка падает. Цикл сам выходит после текущей записи
+        self._stopping = True
+        self._wakeup.set()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        await self.flush()
+        if self._pending:
+            logger.error(f"{len(self._pending)} audit event(s) were not written")
+
+    async def flush(self) -> int:
+        """Insert queued events in batches; returns the number written"""
+        if self._lock is None:
+            return 0
+        written = 0
+        async with self._lock:
+            while self._pending:
+                batch = [self._pending.popleft() for _ in range(min(self.batch_size, len(self._pending)))]
+                try:
+                    await self._insert(batch)
+                except asyncio.CancelledError:
+                    # Остановка посреди вставки: stop() допишет пакет
+                    self._pending.extendleft(reversed(batch))
+                    raise
+                except Exception as e:
+                    # События возвращаются в очередь до следующей попытки
+                    self._pending.extendleft(reversed(batch))
+                    self._trim()
+                    audit_events.inc("failed", amount=len(batch))
+                    logger.error(f"Error writing {len(batch)} audit event(s): {e}")
+                    break
+                written += len(batch)
+        self.written += written
+        if written:
+            audit_events.inc("written", amount=written)
+        return written
+
+    @staticmethod
+    async def _insert(batch) -> None:
+        async with in_transaction() as conn:
+            if conn.capabilities.dialect == "postgres":
+                # Иначе пакет другого воркера с большими id может закоммититься раньше,
+                # и клиент ленты, ушедший за его next_since, пропустит этот пакет
+                await conn.execute_query("SELECT pg_advisory_xact_lock($1)", [FEED_LOCK_KEY])
+            await ProjectChange.bulk_create(batch, using_db=conn)
+
+    def _trim(self) -> None:
+        while len(self._pending) > self.max_pending:
+            self._pending.popleft()
+            self.dropped += 1
+            audit_events.inc("dropped")
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "pending": len(self._pending),
+            "written": self.written,
+            "dropped": self.dropped,
+        }
+
+    async def _flush_forever(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+
+audit_log = AuditLog(
+    batch_size=settings.AUDIT_BATCH_SIZE,
+    flush_interval=settings.AUDIT_FLUSH_INTERVAL,
+    max_pending=settings.AUDIT_MAX_PENDING,
+)
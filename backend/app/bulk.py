@@ -0,0 +1,165 @@
+"""
+Batch writes and NDJSON import/export of the project catalog
+"""
+from datetime import datetime, timezone
+from typing import AsyncIterator, Iterable, List, Optional, Tuple
+
+from tortoise.transactions import in_transaction
+
+from app.audit import AUDITED_FIELDS, audit_log, project_values
+from app.models import Project
+from app.responses import encode_json
+from app.serializers import PROJECT_COLUMNS, project_to_dict
+
+# Колонки, которые можно записывать через пакетные операции
+WRITABLE_COLUMNS = (
+    "title",
+    "title_en",
+    "category",
+    "status",
+    "year",
+    "image",
+    "description",
+    "description_en",
+    "client",
+    "role",
+    "images",
+)
+
+BATCH_SIZE = 500
+
+
+async def upsert_projects(items: Iterable[dict], batch_size: int = BATCH_SIZE) -> Tuple[int, int, List[int]]:
+    """
+    Create or update projects in one transaction
+
+    Items with an ``id`` of an existing project update it, all others are
+    inserted: with ``bulk_create`` and ids taken from the sequence up front on
+    PostgreSQL, row by row on SQLite. Returns (created, updated, ids of the
+    created and updated projects).
+
+    Every created and changed project is queued in ``audit_log`` after the
+    transaction commits.
+    """
+    items = list(items)
+    ids = [item["id"] for item in items if item.get("id") is not None]
+
+    async with in_transaction() as conn:
+        existing = {}
+        if ids:
+            existing = {
+                project.id: project
+                for project in await Project.filter(id__in=ids).using_db(conn)
+            }
+
+        now = datetime.now(timezone.utc)
+        create_values: List[dict] = []
+        to_update: List[Project] = []
+        old_values = {}
+        for item in items:
+            values = {column: item[column] for column in WRITABLE_COLUMNS if column in item}
+            project = existing.get(item.get("id"))
+            if project is None:
+                if item.get("id") is not None:
+                    values["id"] = item["id"]
+                if item.get("created_at") is not None:
+                    values["created_at"] = item["created_at"]
+                create_values.append(values)
+            else:
+                old_values.setdefault(project.id, project_values(project))
+                project.update_from_dict(values)
+                # bulk_update не проставляет auto_now
+                project.updated_at = now
+                to_update.append(project)
+
+        has_explicit_ids = any("id" in values for values in create_values)
+        to_create: List[Project] = []
+        if create_values and conn.capabilities.dialect == "postgres":
+            # id новых строк берутся из последовательности заранее: bulk_create их не возвращает,
+            # а перечитывание по диапазону id захватывает строки параллельных запросов
+            missing = [values for values in create_values if "id" not in values]
+            if missing:
+                rows = await conn.execute_query_dict(
+                    "SELECT nextval(pg_get_serial_sequence('projects', 'id')) AS id "
+                    "FROM generate_series(1, $1)",
+                    [len(missing)],
+                )
+                for values, row in zip(missing, rows):
+                    values["id"] = row["id"]
+            to_create = [Project(**values) for values in create_values]
+            await Project.bulk_create(to_create, batch_size=batch_size, using_db=conn)
+            if has_explicit_ids:
+                # Явные id не двигают последовательность serial; назад её не сдвигаем
+                await conn.execute_query(
+                    "SELECT setval(pg_get_serial_sequence('projects', 'id'), "
+                    "GREATEST((SELECT MAX(id) FROM projects), "
+                    "nextval(pg_get_serial_sequence('projects', 'id'))))"
+                )
+        elif create_values:
+            # SQLite не выдаёт id заранее: строки вставляются по одной, id берутся из INSERT
+            for values in create_values:
+                project = Project(**values)
+                await project.save(using_db=conn)
+                to_create.append(project)
+        if to_update:
+            await Project.bulk_update(
+                to_update,
+                fields=list(WRITABLE_COLUMNS) + ["updated_at"],
+                batch_size=batch_size,
+                using_db=conn,
+            )
+
+    updated_projects = {project.id: project for project in to_update}
+    if audit_log.enabled:
+        for project in to_create:
+            audit_log.created(project.id, project_values(project))
+        for project in updated_projects.values():
+            audit_log.updated(project.id, old_values[project.id], project_values(project))
+    project_ids = [project.id for project in to_create] + list(updated_projects)
+    return len(to_create), len(to_update), project_ids
+
+
+async def delete_projects(ids: Iterable[int]) -> int:
+    """Delete projects by id with a single statement; returns the number deleted
+
+    With the audit log enabled the deleted rows are read first in the same
+    transaction, to record their last values.
+    """
+    ids = list(ids)
+    if not ids:
+        return 0
+    if not audit_log.enabled:
+        return await Project.filter(id__in=ids).delete()
+    async with in_transaction() as conn:
+        rows = await Project.filter(id__in=ids).using_db(conn).order_by("id").values("id", *AUDITED_FIELDS)
+        deleted = await Project.filter(id__in=ids).using_db(conn).delete()
+    for row in rows:
+        audit_log.deleted(row["id"], project_values(row))
+    return deleted
+
+
+async def export_ndjson(chunk_size: int = BATCH_SIZE) -> AsyncIterator[bytes]:
+    """Yield the whole catalog as NDJSON, reading it in chunks ordered by id"""
+    last_id: Optional[int] = None
+    while True:
+        query = Project.all().order_by("id").limit(chunk_size)
+        if last_id is not None:
+            query = query.filter(id__gt=last_id)
+        rows = await query.values(*PROJECT_COLUMNS)
+        if not rows:
+            return
+        yield b"".join(encode_json(project_to_dict(row)) + b"\n" for row in rows)
+        last_id = rows[-1]["id"]
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Split a byte stream into non-empty lines"""
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield line
+    if buffer.strip():
+        yield buffer
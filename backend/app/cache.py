@@ -0,0 +1,207 @@
+"""
+In-process read-through cache for the project catalog
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Optional
+
+from app.config import settings
+from app.db_router import reads_pinned
+
+
+class TTLCache:
+    """
+    LRU cache with a per-entry time to live
+
+    Every invalidation bumps ``generation`` so that a value loaded while a
+    write was in flight is never stored over the fresh state.
+
+    Concurrent misses of the same key share one load (single flight), also
+    when the cache is disabled.
+    """
+
+    def __init__(self, max_size: int = 512, ttl: float = 300.0, enabled: bool = True):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.enabled = enabled
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.coalesced = 0
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[tuple, asyncio.Task] = {}
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return a cached value and mark it as recently used"""
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, generation: Optional[int] = None) -> None:
+        """Store a value, skipping it if the cache was invalidated since ``generation``"""
+        if not self.enabled:
+            return
+        if generation is not None and generation != self.generation:
+            return
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached value for ``key`` or load and store it"""
+        if self.enabled:
+            missing = object()
+            value = self.get(key, missing)
+            if value is not missing:
+                return value
+        # Загрузка, начатая до записи, не годится запросам после нее; клиенты,
+        # читающие с primary, не ждут загрузку с реплики
+        flight = (key, self.generation, reads_pinned())
+        task = self._inflight.get(flight)
+        if task is None:
+            task = asyncio.ensure_future(self._load(key, loader))
+            task.add_done_callback(lambda done: self._landed(flight, done))
+            self._inflight[flight] = task
+        else:
+            self.coalesced += 1
+        # shield: отключившийся клиент не отменяет загрузку для остальных
+        return await asyncio.shield(task)
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        generation = self.generation
+        value = await loader()
+        self.set(key, value, generation=generation)
+        return value
+
+    def _landed(self, flight: tuple, task: asyncio.Task) -> None:
+        if self._inflight.get(flight) is task:
+            del self._inflight[flight]
+        # Ошибку получают ожидающие; если их не осталось, не пишем ее в лог
+        if not task.cancelled():
+            task.exception()
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a single entry"""
+        self.generation += 1
+        if self._data.pop(key, None) is not None:
+            self.invalidations += 1
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Drop every entry whose key matches ``predicate``"""
+        self.generation += 1
+        stale = [key for key in self._data if predicate(key)]
+        for key in stale:
+            del self._data[key]
+        self.invalidations += len(stale)
+        return len(stale)
+
+    def clear(self) -> None:
+        """Drop all entries"""
+        self.generation += 1
+        self.invalidations += len(self._data)
+        self._data.clear()
+
+    def stats(self) -> dict:
+        """Hit/miss counters for monitoring"""
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._inflight),
+        }
+
+
+catalog_cache = TTLCache(
+    max_size=settings.CACHE_MAX_SIZE,
+    ttl=settings.CACHE_TTL,
+    enabled=settings.CACHE_ENABLED,
+)
+
+
+# Ключи кэша:
+#   ("projects", category, status, limit, lang, cursor, include_total, fields) - списки проектов
+#   ("project", project_id, lang)               - отдельный проект
+#   ("categories", lang)                        - категории со счетчиками
+#   ("search", query, limit, offset)            - результаты поиска
+#   ("related", project_id, lang, limit)        - соседи и похожие проекты
+
+def projects_key(
+    category: Optional[str],
+    status: Optional[str],
+    limit: Optional[int],
+    lang: Optional[str],
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    fields: Optional[tuple] = None,
+) -> tuple:
+    return ("projects", category, status, limit, lang, cursor, include_total, fields)
+
+
+def project_key(project_id: int, lang: Optional[str] = None) -> tuple:
+    return ("project", project_id, lang)
+
+
+def categories_key(lang: Optional[str]) -> tuple:
+    return ("categories", lang)
+
+
+def search_key(query: str, limit: int, offset: int) -> tuple:
+    return ("search", query, limit, offset)
+
+
+def related_key(project_id: int, lang: Optional[str], limit: int) -> tuple:
+    return ("related", project_id, lang, limit)
+
+
+def invalidate_project(
+    project_id: int,
+    categories: Iterable[str] = (),
+    statuses: Iterable[str] = (),
+    counts_changed: bool = True,
+) -> None:
+    """
+    Drop cached entries affected by a write to a single project
+
+    - **categories** / **statuses**: values of the project before and after the write;
+      lists filtered by other values stay cached
+    - **counts_changed**: whether category counters could have changed
+    """
+    categories = {getattr(c, "value", c) for c in categories}
+    statuses = {getattr(s, "value", s) for s in statuses}
+
+    def affected(key: Hashable) -> bool:
+        kind = key[0]
+        if kind == "project":
+            return key[1] == project_id
+        if kind == "projects":
+            return (key[1] is None or key[1] in categories) and (key[2] is None or key[2] in statuses)
+        if kind == "categories":
+            return counts_changed
+        if kind in ("search", "related"):
+            # Любая запись может поменять выдачу и соседей других проектов
+            return True
+        return False
+
+    catalog_cache.invalidate_where(affected)
@@ -0,0 +1,235 @@
+"""
+gzip and brotli compression of response bodies
+
+Brotli needs the optional ``brotli`` package; without it only gzip is used.
+Responses are compressed by ``CompressionMiddleware``; pre-serialized bodies
+from ``app.responses`` keep their compressed forms and are compressed once.
+"""
+import gzip
+import time
+import zlib
+from typing import Optional, Tuple
+
+from app.config import settings
+from app.metrics import (
+    compression_bytes,
+    compression_cache,
+    compression_duration,
+    compression_ratio,
+)
+
+try:
+    import brotli
+except ImportError:  # brotli не установлен: только gzip
+    brotli = None
+
+# Типы, которые имеет смысл сжимать; картинки и архивы уже сжаты
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "image/svg+xml",
+    "text/",
+)
+
+
+def available_encodings() -> Tuple[str, ...]:
+    """Supported content codings, best first"""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def compress(data: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    """
+    Compress ``data`` with the given content coding (``gzip`` or ``br``)
+
+    Without **level** the strongest compression is used, which suits files
+    that are compressed once and served many times.
+    """
+    if encoding == "gzip":
+        # mtime=0: одинаковый вход дает одинаковый выход
+        return gzip.compress(data, compresslevel=9 if level is None else level, mtime=0)
+    if encoding == "br" and brotli is not None:
+        return brotli.compress(data, quality=11 if level is None else level)
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+def response_level(encoding: str) -> int:
+    """Compression level for responses compressed while the client waits"""
+    return settings.COMPRESSION_BROTLI_QUALITY if encoding == "br" else settings.COMPRESSION_GZIP_LEVEL
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick the best supported coding from an Accept-Encoding header, or None"""
+    if not accept_encoding or not settings.COMPRESSION_ENABLED:
+        return None
+    weights = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip()] = q
+    best, best_q = None, 0.0
+    for name in available_encodings():
+        q = weights.get(name, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    return bool(content_type) and content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def compress_response(data: bytes, encoding: str) -> bytes:
+    """Compress a response body, recording CPU time and ratio"""
+    start = time.thread_time()
+    compressed = compress(data, encoding, response_level(encoding))
+    _observe(encoding, len(data), len(compressed), time.thread_time() - start)
+    return compressed
+
+
+def compressed_body(cached, encoding: str) -> bytes:
+    """Compressed form of a pre-serialized body, stored on it for reuse"""
+    body = cached.compressed.get(encoding)
+    if body is not None:
+        compression_cache.inc("hit")
+        return body
+    compression_cache.inc("miss")
+    body = cached.compressed[encoding] = compress_response(cached.body, encoding)
+    return body
+
+
+def _observe(encoding: str, original: int, compressed: int, cpu_time: float) -> None:
+    compression_duration.observe(cpu_time, encoding)
+    compression_bytes.inc(encoding, "original", amount=original)
+    compression_bytes.inc(encoding, "compressed", amount=compressed)
+    if original:
+        compression_ratio.observe(compressed / original, encoding)
+
+
+class StreamCompressor:
+    """Incremental compressor for streamed responses; every chunk is flushed"""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        self.original = 0
+        self.compressed = 0
+        self.cpu_time = 0.0
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=response_level(encoding))
+        else:
+            # wbits=31: формат gzip
+            self._compressor = zlib.compressobj(response_level(encoding), zlib.DEFLATED, 31)
+
+    def compress(self, chunk: bytes) -> bytes:
+        start = time.thread_time()
+        if self.encoding == "br":
+            data = self._compressor.process(chunk) + self._compressor.flush()
+        else:
+            # Строки NDJSON должны уходить клиенту сразу, а не копиться в буфере
+            data = self._compressor.compress(chunk) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+        self._account(len(chunk), len(data), time.thread_time() - start)
+        return data
+
+    def finish(self) -> bytes:
+        start = time.thread_time()
+        data = self._compressor.finish() if self.encoding == "br" else self._compressor.flush()
+        self._account(0, len(data), time.thread_time() - start)
+        _observe(self.encoding, self.original, self.compressed, self.cpu_time)
+        return data
+
+    def _account(self, original: int, compressed: int, cpu_time: float) -> None:
+        self.original += original
+        self.compressed += compressed
+        self.cpu_time += cpu_time
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing responses with brotli or gzip
+
+    Bodies smaller than ``COMPRESSION_MIN_SIZE``, non-text types and responses
+    that already have a Content-Encoding are sent as is.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accept = None
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept = value.decode("latin-1")
+                break
+        encoding = choose_encoding(accept)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, _CompressingSend(send, encoding).send)
+
+
+class _CompressingSend:
+    def __init__(self, send, encoding: str):
+        self._send = send
+        self.encoding = encoding
+        self._start = None
+        self._compressor: Optional[StreamCompressor] = None
+        self._passthrough = False
+
+    async def send(self, message):
+        if message["type"] == "http.response.start":
+            self._start = message
+            return
+        if message["type"] != "http.response.body" or self._passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self._compressor is not None:
+            data = self._compressor.compress(body)
+            if not more_body:
+                data += self._compressor.finish()
+            await self._send({"type": "http.response.body", "body": data, "more_body": more_body})
+            return
+
+        # Первый кусок тела: решаем, сжимать ли ответ
+        start, self._start = self._start, None
+        headers = {name.lower(): value for name, value in start.get("headers", [])}
+        content_type = headers.get(b"content-type", b"").decode("latin-1")
+        if (
+            b"content-encoding" in headers
+            or not is_compressible(content_type)
+            or (not more_body and len(body) < settings.COMPRESSION_MIN_SIZE)
+        ):
+            self._passthrough = True
+            await self._send(start)
+            await self._send(message)
+            return
+
+        if more_body:
+            # Потоковый ответ: длина заранее неизвестна
+            self._compressor = StreamCompressor(self.encoding)
+            data = self._compressor.compress(body)
+        else:
+            data = compress_response(body, self.encoding)
+
+        raw_headers = [
+            (name, value) for name, value in start.get("headers", [])
+            if name.lower() != b"content-length"
+        ]
+        raw_headers.append((b"content-encoding", self.encoding.encode()))
+        raw_headers.append((b"vary", b"Accept-Encoding"))
+        if not more_body:
+            raw_headers.append((b"content-length", str(len(data)).encode()))
+        await self._send({**start, "headers": raw_headers})
+        await self._send({"type": "http.response.body", "body": data, "more_body": more_body})
@@ -1,38 +1,134 @@
-from tortoise import Tortoise
+import asyncio
+from pathlib import Path
+from typing import List, Optional
+from tortoise import Tortoise, connections
+from tortoise.backends.base.config_generator import expand_db_url
 from app.config import settings
+from app.db_router import REPLICAS
 import logging
 
 logger = logging.getLogger(__name__)
 
-TORTOISE_ORM = {
-    "connections": {
-        "default": settings.DATABASE_URL
-    },
-    "apps": {
-        "models": {
-            "models": ["app.models", "aerich.models"],
-            "default_connection": "default",
+# Миграции aerich (см. [tool.aerich] в pyproject.toml)
+MIGRATIONS_LOCATION = str(Path(__file__).resolve().parent.parent / "migrations")
+
+
+def uses_postgres() -> bool:
+    return settings.DATABASE_URL.startswith(("postgres://", "postgresql://", "asyncpg://"))
+
+
+def build_connection(db_url: str) -> dict:
+    """Expand a database URL and add the pool settings for PostgreSQL"""
+    config = expand_db_url(db_url)
+    if config["engine"] == "tortoise.backends.asyncpg":
+        config["engine"] = "app.pg_client"
+        credentials = config["credentials"]
+        # Параметры из самого URL (?maxsize=...) имеют приоритет
+        credentials.setdefault("minsize", settings.DB_POOL_MIN_SIZE)
+        credentials.setdefault("maxsize", settings.DB_POOL_MAX_SIZE)
+        credentials.setdefault("acquire_timeout", settings.DB_POOL_ACQUIRE_TIMEOUT)
+        credentials.setdefault("max_inactive_connection_lifetime", settings.DB_POOL_MAX_IDLE_TIME)
+        credentials.setdefault("max_queries", settings.DB_POOL_MAX_QUERIES)
+        credentials.setdefault("statement_cache_size", settings.DB_STATEMENT_CACHE_SIZE)
+        if settings.DB_COMMAND_TIMEOUT is not None:
+            credentials.setdefault("command_timeout", settings.DB_COMMAND_TIMEOUT)
+    return config
+
+
+def build_tortoise_config(include_aerich: bool = True, include_replicas: bool = False) -> dict:
+    """Tortoise config shared by the app and the aerich CLI"""
+    models = ["app.models"]
+    if include_aerich:
+        models.append("aerich.models")
+    config = {
+        "connections": {
+            "default": build_connection(settings.DATABASE_URL)
+        },
+        "apps": {
+            "models": {
+                "models": models,
+                "default_connection": "default",
+            },
         },
-    },
-}
+    }
+    if include_replicas and REPLICAS:
+        # Миграции и схема только на primary; реплики нужны лишь приложению
+        for name, url in zip(REPLICAS, settings.read_urls_list):
+            config["connections"][name] = build_connection(url)
+        config["routers"] = ["app.db_router.ReadReplicaRouter"]
+    return config
+
+
+TORTOISE_ORM = build_tortoise_config()
 
 
 async def init_db():
-    """Initialize database connection"""
+    """
+    Initialize database connection
+
+    The schema is not checked: on PostgreSQL it is managed by migrations
+    (``migrate_db``), applied once before the workers start.
+    """
     try:
-        await Tortoise.init(
-            db_url=settings.DATABASE_URL,
-            modules={"models": ["app.models"]}
-        )
-        # Generate schemas
-        await Tortoise.generate_schemas()
+        await Tortoise.init(config=build_tortoise_config(include_aerich=False, include_replicas=True))
+        if not uses_postgres():
+            # Миграции написаны для PostgreSQL; SQLite (разработка, бенчмарки)
+            # получает недостающие таблицы прямо из моделей
+            await Tortoise.generate_schemas(safe=True)
+        if REPLICAS:
+            logger.info(f"Routing reads to {len(REPLICAS)} replica(s)")
         logger.info("Database initialized successfully")
     except Exception as e:
         logger.error(f"Error initializing database: {e}")
         raise
 
 
+async def migrate_db() -> List[str]:
+    """
+    Apply pending aerich migrations; returns the applied migration files
+
+    Runs on its own connections, before ``init_db``. On databases other than
+    PostgreSQL missing tables are created from the models instead.
+    """
+    if not uses_postgres():
+        await Tortoise.init(config=build_tortoise_config(include_aerich=False))
+        try:
+            await Tortoise.generate_schemas(safe=True)
+        finally:
+            await Tortoise.close_connections()
+        return []
+
+    from aerich import Command
+
+    async with Command(tortoise_config=TORTOISE_ORM, location=MIGRATIONS_LOCATION) as command:
+        await command.init()
+        migrated = await command.upgrade()
+    for version in migrated:
+        logger.info(f"Applied migration {version}")
+    return migrated
+
+
+async def check_db(timeout: Optional[float] = None) -> None:
+    """
+    Run a trivial query on the primary; raises if it fails or takes too long
+
+    The first call also opens the connection pool, which is otherwise created
+    by the first request.
+    """
+    conn = connections.get("default")
+    await asyncio.wait_for(conn.execute_query("SELECT 1"), timeout)
+
+
 async def close_db():
     """Close database connections"""
     await Tortoise.close_connections()
     logger.info("Database connections closed")
+
+
+def pool_stats(connection_name: str = "default") -> dict:
+    """Live statistics of a connection pool (the primary by default)"""
+    conn = connections.get(connection_name)
+    if hasattr(conn, "pool_stats"):
+        return {"backend": "asyncpg", **conn.pool_stats()}
+    # SQLite и другие бэкенды без пула: одно соединение
+    return {"backend": type(conn).__name__}
@@ -0,0 +1,107 @@
+"""
+Routing of ORM queries between the primary database and read replicas
+
+Writes always go to the primary (``default`` connection). Reads go to the
+replicas round-robin, except:
+
+- during requests with an unsafe method (POST/PUT/PATCH/DELETE), so that a
+  handler reads back exactly what it has just written;
+- for ``DB_READ_AFTER_WRITE_WINDOW`` seconds after a write in this process,
+  so that cache entries are not refilled from a lagging replica;
+- for clients that carry the read-your-writes cookie set on successful write
+  responses, whichever worker serves them.
+"""
+import itertools
+import math
+import time
+from contextvars import ContextVar
+from typing import List, Optional
+
+from tortoise import connections
+from tortoise.backends.base.client import BaseDBAsyncClient
+
+from app.config import settings
+
+PRIMARY = "default"
+READ_COOKIE = "read_primary"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# Имена соединений реплик: replica_1, replica_2, ...
+REPLICAS: List[str] = [f"replica_{i}" for i, _ in enumerate(settings.read_urls_list, start=1)]
+
+_use_primary: ContextVar[bool] = ContextVar("use_primary", default=False)
+_replica_cycle = itertools.cycle(REPLICAS) if REPLICAS else None
+_last_write = float("-inf")
+
+
+def mark_write() -> None:
+    """Start the read-your-writes window after a write"""
+    global _last_write
+    _last_write = time.monotonic()
+
+
+def reads_pinned() -> bool:
+    """Whether reads of the current request are pinned to the primary"""
+    return _use_primary.get()
+
+
+def read_connection_name() -> str:
+    """Connection to use for the next read query"""
+    if _replica_cycle is None or _use_primary.get():
+        return PRIMARY
+    if time.monotonic() - _last_write < settings.DB_READ_AFTER_WRITE_WINDOW:
+        return PRIMARY
+    return next(_replica_cycle)
+
+
+def read_connection() -> BaseDBAsyncClient:
+    """Connection for raw read-only SQL"""
+    return connections.get(read_connection_name())
+
+
+class ReadReplicaRouter:
+    """Tortoise router: reads to the replicas, writes to the primary"""
+
+    def db_for_read(self, model) -> Optional[str]:
+        return read_connection_name()
+
+    def db_for_write(self, model) -> Optional[str]:
+        return PRIMARY
+
+
+class PrimaryRoutingMiddleware:
+    """ASGI middleware pinning writes and recent writers to the primary"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not REPLICAS:
+            await self.app(scope, receive, send)
+            return
+
+        is_write = scope["method"] not in SAFE_METHODS
+        pinned = is_write or _has_read_cookie(scope)
+        token = _use_primary.set(pinned)
+
+        async def send_wrapper(message):
+            # Отклоненный запрос (4xx/5xx, в т.ч. 429) ничего не записал: окно и cookie не нужны
+            if is_write and message["type"] == "http.response.start" and message["status"] < 400:
+                mark_write()
+                # Клиент читает с primary, пока реплики догоняют запись
+                window = math.ceil(settings.DB_READ_AFTER_WRITE_WINDOW)
+                cookie = f"{READ_COOKIE}=1; Max-Age={window}; Path=/; HttpOnly; SameSite=Lax"
+                message["headers"] = list(message.get("headers", [])) + [(b"set-cookie", cookie.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _use_primary.reset(token)
+
+
+def _has_read_cookie(scope) -> bool:
+    for name, value in scope["headers"]:
+        if name == b"cookie" and f"{READ_COOKIE}=".encode() in value:
+            return True
+    return False
@@ -0,0 +1,321 @@
+"""
+Image metadata pipeline: dimensions, blurhash placeholders and resized variants
+
+Runs in the background after a project is created or updated. Images are read
+from the local media store:
+
+- URLs under ``MEDIA_URL`` map to files in ``MEDIA_ROOT``;
+- any other URL maps to ``MEDIA_ROOT/sources/<hash of the URL>`` if a copy
+  was put there (nothing is downloaded).
+
+Results are stored in ``Project.media`` keyed by image URL. Processing needs
+Pillow (``pip install pillow``); without it projects simply have no metadata.
+
+Backfill existing projects with ``python -m app.images``.
+"""
+import asyncio
+import hashlib
+import importlib.util
+import logging
+import math
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.config import settings
+from app.invalidation import invalidation_channel
+from app.models import Project
+
+# Pillow импортируется только при обработке: воркеры стартуют быстрее
+PILLOW_INSTALLED = importlib.util.find_spec("PIL") is not None
+
+logger = logging.getLogger(__name__)
+
+# Параметры кодирования вариантов
+FORMAT_OPTIONS = {
+    "webp": {"format": "WEBP", "quality": 80, "method": 4},
+    "avif": {"format": "AVIF", "quality": 55, "speed": 6},
+}
+
+BLURHASH_SIZE = 32  # сторона миниатюры, по которой считается blurhash
+
+# Не больше одной обработки на воркер: ресайз занимает CPU
+_processing = asyncio.Semaphore(1)
+
+
+def available() -> bool:
+    # Без Pillow метаданные не вычисляются
+    return PILLOW_INSTALLED and settings.IMAGE_PROCESSING_ENABLED
+
+
+def output_formats() -> List[str]:
+    """Configured variant formats the installed Pillow can write"""
+    from PIL import features
+
+    return [
+        name for name in settings.image_formats_list
+        if name in FORMAT_OPTIONS and features.check(name)
+    ]
+
+
+def source_path(url: str) -> Optional[Path]:
+    """Local file with the original image for ``url``, if there is one"""
+    root = Path(settings.MEDIA_ROOT).resolve()
+    prefix = settings.MEDIA_URL.rstrip("/") + "/"
+    if url.startswith(prefix):
+        path = (root / url[len(prefix):]).resolve()
+        # Не выпускаем путь за пределы MEDIA_ROOT
+        if root not in path.parents:
+            return None
+    else:
+        path = root / "sources" / hashlib.blake2b(url.encode(), digest_size=16).hexdigest()
+    return path if path.is_file() else None
+
+
+def process_image(url: str) -> Optional[dict]:
+    """
+    Compute metadata and write variants for one image; blocking
+
+    Returns None when there is no local copy or the file is not an image.
+    """
+    from PIL import Image, ImageOps
+
+    path = source_path(url)
+    if path is None:
+        return None
+
+    data = path.read_bytes()
+    # Имя вариантов зависит от содержимого: новый файл - новые URL
+    key = hashlib.blake2b(data, digest_size=8).hexdigest()
+    try:
+        with Image.open(path) as original:
+            image = ImageOps.exif_transpose(original)
+            image.load()
+    except (OSError, SyntaxError) as e:
+        logger.warning(f"Cannot read image {url}: {e}")
+        return None
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+
+    width, height = image.size
+    variants_dir = Path(settings.MEDIA_ROOT) / "variants"
+    variants_dir.mkdir(parents=True, exist_ok=True)
+    base_url = settings.MEDIA_URL.rstrip("/") + "/variants"
+
+    # Увеличивать не имеет смысла: самый большой вариант не шире оригинала
+    widths = sorted({min(w, width) for w in settings.variant_widths_list})
+    variants = []
+    for variant_width in widths:
+        variant_height = max(1, round(height * variant_width / width))
+        resized = None
+        for name in output_formats():
+            filename = f"{key}-{variant_width}.{name}"
+            target = variants_dir / filename
+            if not target.exists():
+                if resized is None:
+                    resized = image if variant_width == width else image.resize(
+                        (variant_width, variant_height), Image.Resampling.LANCZOS
+                    )
+                _save_atomic(resized, target, FORMAT_OPTIONS[name])
+            variants.append({
+                "url": f"{base_url}/{filename}",
+                "width": variant_width,
+                "height": variant_height,
+                "format": name,
+            })
+
+    return {
+        "width": width,
+        "height": height,
+        "blurhash": blurhash_for(image),
+        "variants": variants,
+    }
+
+
+def _save_atomic(image, target: Path, options: dict) -> None:
+    # Другой воркер может обрабатывать тот же файл; полузаписанный вариант не отдаем
+    tmp = target.with_name(f".{target.name}.tmp")
+    image.save(tmp, **options)
+    tmp.replace(target)
+
+
+# --- blurhash (https://blurha.sh) ---
+
+_BASE83 = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz#$%*+,-.:;=?@[]^_{|}~"
+
+
+def _encode83(value: int, length: int) -> str:
+    return "".join(_BASE83[(value // 83 ** (length - i - 1)) % 83] for i in range(length))
+
+
+def _srgb_to_linear(value: int) -> float:
+    v = value / 255
+    return v / 12.92 if v <= 0.04045 else ((v + 0.055) / 1.055) ** 2.4
+
+
+def _linear_to_srgb(value: float) -> int:
+    v = max(0.0, min(1.0, value))
+    if v <= 0.0031308:
+        return int(v * 12.92 * 255 + 0.5)
+    return int((1.055 * v ** (1 / 2.4) - 0.055) * 255 + 0.5)
+
+
+def _sign_pow(value: float, exp: float) -> float:
+    return math.copysign(abs(value) ** exp, value)
+
+
+def blurhash_for(image) -> str:
+    """Blurhash of a Pillow image, 4x3 or 3x4 components depending on orientation"""
+    thumb = image.convert("RGB")
+    thumb.thumbnail((BLURHASH_SIZE, BLURHASH_SIZE))
+    x_components, y_components = (4, 3) if thumb.width >= thumb.height else (3, 4)
+    # getdata устарел в новых версиях Pillow
+    pixels = list(getattr(thumb, "get_flattened_data", thumb.getdata)())
+    return encode_blurhash(pixels, thumb.width, thumb.height, x_components, y_components)
+
+
+def encode_blurhash(
+    pixels: List[Tuple[int, int, int]],
+    width: int,
+    height: int,
+    x_components: int = 4,
+    y_components: int = 3,
+) -> str:
+    """Encode row-major RGB pixels into a blurhash string"""
+    linear = [(_srgb_to_linear(r), _srgb_to_linear(g), _srgb_to_linear(b)) for r, g, b in pixels]
+    # Косинусы зависят только от координаты, считаем их один раз
+    cos_x = [[math.cos(math.pi * i * x / width) for x in range(width)] for i in range(x_components)]
+    cos_y = [[math.cos(math.pi * j * y / height) for y in range(height)] for j in range(y_components)]
+
+    factors = []
+    for j in range(y_components):
+        for i in range(x_components):
+            r = g = b = 0.0
+            for y in range(height):
+                row_basis = cos_y[j][y]
+                offset = y * width
+                for x in range(width):
+                    basis = cos_x[i][x] * row_basis
+                    pr, pg, pb = linear[offset + x]
+                    r += basis * pr
+                    g += basis * pg
+                    b += basis * pb
+            scale = (1 if i == 0 and j == 0 else 2) / (width * height)
+            factors.append((r * scale, g * scale, b * scale))
+
+    dc, ac = factors[0], factors[1:]
+    result = _encode83((x_components - 1) + (y_components - 1) * 9, 1)
+    if ac:
+        quantised_max = max(0, min(82, int(math.floor(max(abs(v) for f in ac for v in f) * 166 - 0.5))))
+        max_value = (quantised_max + 1) / 166
+        result += _encode83(quantised_max, 1)
+    else:
+        max_value = 1.0
+        result += _encode83(0, 1)
+
+    result += _encode83(
+        (_linear_to_srgb(dc[0]) << 16) + (_linear_to_srgb(dc[1]) << 8) + _linear_to_srgb(dc[2]), 4
+    )
+    for factor in ac:
+        r, g, b = (
+            max(0, min(18, int(math.floor(_sign_pow(v / max_value, 0.5) * 9 + 9.5)))) for v in factor
+        )
+        result += _encode83(r * 19 * 19 + g * 19 + b, 2)
+    return result
+
+
+# --- обработка проектов ---
+
+def _project_urls(image: str, images: Iterable[str]) -> List[str]:
+    return list(dict.fromkeys([image, *(images or [])]))
+
+
+def _process_many(urls: List[str]) -> Dict[str, dict]:
+    results = {}
+    for url in urls:
+        try:
+            meta = process_image(url)
+        except Exception as e:
+            logger.error(f"Error processing image {url}: {e}")
+            continue
+        if meta is not None:
+            results[url] = meta
+    return results
+
+
+async def process_project_images(project_id: int) -> bool:
+    """
+    Fill ``Project.media`` for images that have no metadata yet
+
+    Entries of images no longer used by the project are dropped. Returns
+    whether the project was changed.
+    """
+    if not available():
+        return False
+
+    async with _processing:
+        project = await Project.get_or_none(id=project_id)
+        if project is None:
+            return False
+        media = project.media or {}
+        pending = [url for url in _project_urls(project.image, project.images) if url not in media]
+        processed = await asyncio.to_thread(_process_many, pending) if pending else {}
+
+        # Проект мог измениться, пока шла обработка: сверяемся со свежими URL
+        current = await Project.get_or_none(id=project_id)
+        if current is None:
+            return False
+        urls = _project_urls(current.image, current.images)
+        merged = {**(current.media or {}), **processed}
+        media = {url: merged[url] for url in urls if url in merged}
+        if media == (current.media or {}):
+            return False
+
+        current.media = media
+        await current.save(update_fields=["media", "updated_at"])
+        await invalidation_channel.project_changed(
+            project_id, [current.category], [current.status], counts_changed=False
+        )
+        logger.info(f"Image metadata updated for project {project_id}: {len(processed)} processed")
+        return True
+
+
+async def process_missing_images(project_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    Process projects whose images lack metadata; returns projects updated
+
+    Only ``project_ids`` are checked when given (the projects of a batch
+    write), otherwise the whole catalog. Images without a local source are
+    skipped: there is nothing to process until a copy is put into
+    ``MEDIA_ROOT``.
+    """
+    if not available():
+        return 0
+    query = Project.all() if project_ids is None else Project.filter(id__in=list(project_ids))
+    updated = 0
+    for row in await query.order_by("id").values("id", "image", "images", "media"):
+        media = row["media"] or {}
+        urls = _project_urls(row["image"], row["images"])
+        pending = [url for url in urls if url not in media and source_path(url) is not None]
+        stale = set(media) - set(urls)
+        if (pending or stale) and await process_project_images(row["id"]):
+            updated += 1
+    return updated
+
+
+async def main() -> None:
+    from tortoise import Tortoise
+    from app.database import build_tortoise_config
+
+    logging.basicConfig(level=logging.INFO)
+    if not available():
+        raise SystemExit("Pillow is not installed or IMAGE_PROCESSING_ENABLED=false")
+    await Tortoise.init(config=build_tortoise_config(include_aerich=False))
+    try:
+        updated = await process_missing_images()
+        print(f"Image metadata updated for {updated} project(s)")
+    finally:
+        await Tortoise.close_connections()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,193 @@
+"""
+Catalog cache invalidation shared between worker processes
+
+Every uvicorn worker keeps its own in-process cache. On PostgreSQL writes are
+broadcast with ``NOTIFY`` and every worker ``LISTEN``s on a dedicated
+connection, dropping the same entries the writing worker dropped. Other
+databases have no channel: there the cache is only coherent with one worker.
+"""
+import asyncio
+import json
+import logging
+import os
+import uuid
+from typing import Iterable, List, Optional
+
+from tortoise import connections
+from tortoise.backends.base.config_generator import expand_db_url
+
+from app.cache import catalog_cache, invalidate_project
+from app.config import settings
+from app.database import uses_postgres
+from app.db_router import mark_write
+
+logger = logging.getLogger(__name__)
+
+RECONNECT_DELAY = 1.0
+MAX_RECONNECT_DELAY = 30.0
+
+
+class InvalidationChannel:
+    """Apply cache invalidations locally and broadcast them to the other workers"""
+
+    def __init__(self, channel: str):
+        self.channel = channel
+        # Свои уведомления тоже приходят по LISTEN; их пропускаем по origin
+        self.origin = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.sent = 0
+        self.received = 0
+        self._connection = None  # asyncpg.Connection
+        self._task: Optional[asyncio.Task] = None
+        self._lost: Optional[asyncio.Event] = None
+        self._listeners: List = []
+        self._remote_listeners: List = []
+
+    @property
+    def enabled(self) -> bool:
+        return catalog_cache.enabled and uses_postgres()
+
+    async def start(self) -> None:
+        """Start listening in the background"""
+        if not self.enabled:
+            if settings.WORKERS != 1 and catalog_cache.enabled:
+                logger.warning("Cache invalidation is not shared between workers on this database")
+            return
+        self._task = asyncio.create_task(self._listen_forever())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._close()
+
+    def add_listener(self, listener, remote: bool = False) -> None:
+        """
+        Report writes made by this worker to ``listener``
+
+        The listener has synchronous ``project_changed(project_id, categories,
+        statuses, counts_changed)`` and ``catalog_changed()`` methods. With
+        **remote** it also hears the writes of the other workers.
+        """
+        self._listeners.append(listener)
+        if remote:
+            self._remote_listeners.append(listener)
+
+    async def project_changed(
+        self,
+        project_id: int,
+        categories: Iterable[str] = (),
+        statuses: Iterable[str] = (),
+        counts_changed: bool = True,
+    ) -> None:
+        """Drop cached entries of one project here and in every other worker"""
+        categories = [getattr(c, "value", c) for c in categories]
+        statuses = [getattr(s, "value", s) for s in statuses]
+        invalidate_project(project_id, categories, statuses, counts_changed)
+        for listener in self._listeners:
+            listener.project_changed(project_id, categories, statuses, counts_changed)
+        await self._publish({
+            "op": "project",
+            "id": project_id,
+            "categories": categories,
+            "statuses": statuses,
+            "counts_changed": counts_changed,
+        })
+
+    async def catalog_changed(self) -> None:
+        """Drop the whole catalog cache here and in every other worker"""
+        catalog_cache.clear()
+        for listener in self._listeners:
+            listener.catalog_changed()
+        await self._publish({"op": "clear"})
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "listening": self._connection is not None,
+            "sent": self.sent,
+            "received": self.received,
+        }
+
+    async def _publish(self, event: dict) -> None:
+        if not self.enabled:
+            return
+        event["origin"] = self.origin
+        try:
+            await connections.get("default").execute_query(
+                "SELECT pg_notify($1, $2)", [self.channel, json.dumps(event)]
+            )
+            self.sent += 1
+        except Exception as e:
+            # Запись уже выполнена; остальные воркеры досмотрят до истечения TTL
+            logger.error(f"Error publishing cache invalidation: {e}")
+
+    def _on_notify(self, connection, pid, channel, payload) -> None:
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            logger.warning(f"Ignoring malformed invalidation payload: {payload!r}")
+            return
+        if event.get("origin") == self.origin:
+            return
+        self.received += 1
+        # Реплики могут еще не видеть запись: читаем с primary, как и писавший воркер
+        mark_write()
+        if event.get("op") == "project":
+            invalidate_project(
+                event["id"], event["categories"], event["statuses"], event["counts_changed"]
+            )
+            for listener in self._remote_listeners:
+                listener.project_changed(
+                    event["id"], event["categories"], event["statuses"], event["counts_changed"]
+                )
+        else:
+            catalog_cache.clear()
+            for listener in self._remote_listeners:
+                listener.catalog_changed()
+
+    async def _listen_forever(self) -> None:
+        # Только для PostgreSQL; на SQLite asyncpg не импортируется вовсе
+        import asyncpg
+
+        delay = RECONNECT_DELAY
+        while True:
+            try:
+                self._lost = asyncio.Event()
+                self._connection = await asyncpg.connect(**_listener_credentials())
+                self._connection.add_termination_listener(lambda connection: self._lost.set())
+                await self._connection.add_listener(self.channel, self._on_notify)
+                # Пока соединения не было, уведомления терялись
+                catalog_cache.clear()
+                logger.info(f"Listening for cache invalidations on '{self.channel}'")
+                delay = RECONNECT_DELAY
+                await self._lost.wait()
+                logger.warning("Cache invalidation listener disconnected")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Cache invalidation listener error: {e}")
+            await self._close()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MAX_RECONNECT_DELAY)
+
+    async def _close(self) -> None:
+        connection, self._connection = self._connection, None
+        if connection is not None and not connection.is_closed():
+            try:
+                await connection.close(timeout=5)
+            except Exception:
+                connection.terminate()
+
+
+def _listener_credentials() -> dict:
+    """Connection arguments of the primary, without Tortoise pool options"""
+    credentials = expand_db_url(settings.DATABASE_URL)["credentials"]
+    keys = ("host", "port", "user", "password", "database", "ssl")
+    return {key: credentials[key] for key in keys if credentials.get(key) is not None}
+
+
+invalidation_channel = InvalidationChannel(settings.CACHE_INVALIDATION_CHANNEL)
@@ -1,37 +1,144 @@
-from fastapi import FastAPI, HTTPException, Query
+# Первым: отсчет времени импортов для профиля запуска
+from app.startup import startup_profile, warmup
+
+from fastapi import BackgroundTasks, FastAPI, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from pydantic import ValidationError
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
-from typing import Optional
+from typing import AsyncIterator, Optional, Union
+from tortoise.functions import Count
+from tortoise.queryset import QuerySet
+import asyncio
 import logging
 
 from app.config import settings
-from app.database import init_db, close_db
-from app.models import Project, CATEGORY_TRANSLATIONS, STATUS_TRANSLATIONS
+from app.database import init_db, check_db, close_db, pool_stats
+from app.models import (
+    Project,
+    ProjectChange,
+    CategoryEnum,
+    CATEGORY_TRANSLATIONS,
+    CATEGORY_TRANSLATIONS_REVERSE,
+)
 from app.schemas import (
     ProjectResponse, 
     ProjectListResponse, 
+    ProjectSummaryListResponse,
+    LocalizedProjectResponse,
+    LocalizedProjectListResponse,
+    LocalizedProjectSummaryListResponse,
+    LocalizedRelatedProjectsResponse,
+    ProjectSearchResponse,
+    ProjectBulkItem,
+    ProjectBulkRequest,
+    ProjectBulkDeleteRequest,
+    BulkWriteResponse,
+    ImportResponse,
     ProjectCreate,
     ProjectUpdate,
-    MessageResponse
+    MessageResponse,
+    CacheStatsResponse,
+    PoolStatsResponse,
+    ReadinessResponse,
+    RelatedProjectsResponse,
+    ChangeFeedResponse,
+)
+from app.cache import (
+    catalog_cache,
+    projects_key,
+    project_key,
+    categories_key,
+    search_key,
+    related_key,
+)
+from app.responses import CachedBody, serialize, cached_response, encode_json
+from app.pagination import ORDERING, encode_cursor, decode_cursor, apply_cursor, iter_chunks
+from app.serializers import (
+    PROJECT_COLUMNS,
+    SUMMARY_FIELDS,
+    LOCALIZED_FIELDS,
+    LOCALIZED_VIEWS,
+    project_to_dict,
+    project_row,
+    check_lang,
+    parse_fields,
+    columns_for,
+    row_to_dict,
+    localized_values,
+    localize_rows,
+)
+from app.search import (
+    init_search,
+    index_project,
+    unindex_project,
+    reindex_projects,
+    search_projects,
 )
+from app.related import related_index
+from app.audit import audit_log, project_values
+from app.metrics import MetricsMiddleware, instrument_db, registry
+from app.compression import CompressionMiddleware
+from app.ratelimit import RateLimitMiddleware
+from app.db_router import PRIMARY, REPLICAS, PrimaryRoutingMiddleware
+from app.invalidation import invalidation_channel
+from app.images import process_project_images, process_missing_images
+from app.snapshot import SnapshotWriter, build_on_startup
+from app.bulk import BATCH_SIZE, upsert_projects, delete_projects, export_ndjson, iter_lines
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+startup_profile.mark("imports")
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for startup and shutdown events"""
     # Startup
     logger.info("Starting up...")
-    await init_db()
+    with startup_profile.step("init_db"):
+        await init_db()
+    instrument_db()
+    # Первому запросу не нужны: с FAST_START догреваются в фоне
+    warmup.add("db_pool", _open_pool())
+    warmup.add("search_index", init_search())
+    warmup.add("related_index", related_index.build())
+    if not settings.FAST_START:
+        await warmup.wait_all()
+    with startup_profile.step("invalidation"):
+        await invalidation_channel.start()
+    await audit_log.start()
+    snapshot_build = None
+    if snapshot_writer is not None:
+        snapshot_build = asyncio.create_task(build_on_startup(snapshot_writer))
+    startup_profile.ready()
+    warmup_done = asyncio.create_task(warmup.finish(log_summary=settings.STARTUP_PROFILE))
     yield
     # Shutdown
     logger.info("Shutting down...")
+    warmup_done.cancel()
+    await warmup.cancel()
+    await related_index.close()
+    if snapshot_build is not None:
+        snapshot_build.cancel()
+    await invalidation_channel.stop()
+    # Очередь журнала дописывается до закрытия соединений
+    await audit_log.stop()
     await close_db()
 
 
+async def _open_pool() -> None:
+    """Open the connection pool before the first request needs it"""
+    try:
+        await check_db(settings.DB_POOL_ACQUIRE_TIMEOUT)
+    except Exception as e:
+        # Как и раньше, без базы воркер все равно стартует; /api/ready вернет 503
+        logger.warning(f"Database is not reachable yet: {e}")
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Portfolio Backend API",
@@ -40,6 +147,9 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Лимит запросов на IP; внутри CORS, чтобы ответ 429 был виден браузеру
+app.add_middleware(RateLimitMiddleware)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -49,6 +159,32 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Сжатие ответов; готовые тела из кэша сжимает cached_response
+app.add_middleware(CompressionMiddleware)
+
+# Метрики запросов и SQL для /metrics
+app.add_middleware(MetricsMiddleware)
+
+# Записи и недавно писавшие клиенты читают с primary, остальные с реплик
+app.add_middleware(PrimaryRoutingMiddleware)
+
+# Индекс соседей и похожих проектов следует за записями всех воркеров
+invalidation_channel.add_listener(related_index, remote=True)
+
+# Статические копии ответов для nginx обновляются после каждой записи
+snapshot_writer = None
+if settings.SNAPSHOT_ROOT:
+    snapshot_writer = SnapshotWriter(settings.SNAPSHOT_ROOT, app)
+    invalidation_channel.add_listener(snapshot_writer)
+
+# Оригиналы и варианты картинок; в продакшне их отдает nginx
+app.mount(settings.MEDIA_URL, StaticFiles(directory=settings.MEDIA_ROOT, check_dir=False), name="media")
+
+
+def _serialize_project(project: Project) -> CachedBody:
+    """Pre-serialize a project response in the ProjectResponse shape"""
+    return serialize(project_to_dict(project_row(project)), ProjectResponse, last_modified=project.updated_at)
+
 
 @app.get("/", response_model=MessageResponse)
 async def root():
@@ -58,129 +194,469 @@ async def root():
 
 @app.get("/api/health", response_model=MessageResponse)
 async def health_check():
-    """Health check endpoint"""
+    """Health check endpoint (liveness: the process answers, nothing else is checked)"""
     return {"message": "OK"}
 
 
-@app.get("/api/projects", response_model=ProjectListResponse)
+@app.get("/api/ready", response_model=ReadinessResponse)
+async def readiness_check(response: Response):
+    """
+    Readiness probe: 200 when the worker can serve requests, 503 otherwise
+
+    Checks that the primary database answers within ``READY_DB_TIMEOUT``.
+    Startup steps still warming up in the background are listed in
+    ``pending`` but do not make the worker unready.
+    """
+    database = "ok"
+    try:
+        await check_db(settings.READY_DB_TIMEOUT)
+    except asyncio.TimeoutError:
+        database = "timeout"
+    except Exception as e:
+        logger.warning(f"Readiness check failed: {e}")
+        database = "unavailable"
+    ready = database == "ok"
+    if not ready:
+        response.status_code = 503
+    return {
+        "ready": ready,
+        "database": database,
+        "pending": warmup.pending(),
+        "failed": warmup.failed(),
+        "startup": startup_profile.report()["steps"],
+    }
+
+
+# Форма ответа зависит от lang и view, в схеме OpenAPI перечислены все варианты
+@app.get(
+    "/api/projects",
+    response_model=Union[
+        ProjectListResponse,
+        ProjectSummaryListResponse,
+        LocalizedProjectListResponse,
+        LocalizedProjectSummaryListResponse,
+    ],
+)
 async def get_projects(
+    request: Request,
     category: Optional[str] = Query(None, description="Filter by category"),
     status: Optional[str] = Query(None, description="Filter by status"),
-    limit: Optional[int] = Query(None, description="Limit number of results"),
-    lang: Optional[str] = Query("ru", description="Language code (ru/en)"),
+    limit: Optional[int] = Query(None, ge=1, description="Limit number of results"),
+    lang: Optional[str] = Query(None, description="Language code (ru/en); omit to get both languages"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from next_cursor of the previous page"),
+    include_total: bool = Query(True, description="Count all matching projects"),
+    fields: Optional[str] = Query(None, description="Comma-separated list of fields to return"),
+    view: Optional[str] = Query(None, description="Predefined field set: summary or full"),
+    stream: bool = Query(False, description="Stream projects as NDJSON"),
 ):
     """
     Get all projects with optional filters
     
     - **category**: Filter by category (works with both RU and EN names)
     - **status**: Filter by status (В работе, Завершен)
-    - **limit**: Limit number of results
-    - **lang**: Language for response (ru/en)
+    - **limit**: Limit number of results (page size when paginating)
+    - **lang**: Return title, description, category and status in one language (ru/en)
+    - **cursor**: Continue after the last project of the previous page
+    - **include_total**: Set to false to skip the COUNT query; total is then null
+    - **fields**: Return only these fields, e.g. `title,category,year,image` (id is always included)
+    - **view**: `summary` returns the compact representation used by the project grid
+    - **stream**: Send one project per line as NDJSON while reading the database in chunks
+      (also enabled by `Accept: application/x-ndjson`); total and next_cursor are not sent
     """
     try:
-        query = Project.all()
-        
         # Apply filters - поддержка фильтрации и по русским и по английским названиям
+        ru_category = None
         if category and category != "Все" and category != "All":
-            # Попробуем найти по русскому названию или по английскому
-            ru_category = category
             # Если передана английская категория, конвертируем в русскую для фильтра
-            if category in ["Design", "Development", "Startups", "Other"]:
-                category_map = {
-                    "Design": "Дизайн",
-                    "Development": "Разработка", 
-                    "Startups": "Стартапы",
-                    "Other": "Другое"
-                }
-                ru_category = category_map.get(category, category)
-            query = query.filter(category=ru_category)
-        if status:
-            query = query.filter(status=status)
-        
-        # Get total count
-        total = await query.count()
+            ru_category = CATEGORY_TRANSLATIONS_REVERSE.get(category, category)
         
-        # Apply limit
-        if limit:
-            query = query.limit(limit)
+        lang = check_lang(lang)
+        selected = parse_fields(fields, view, lang)
         
-        projects = await query
+        if stream or "application/x-ndjson" in request.headers.get("accept", ""):
+            if cursor:
+                decode_cursor(cursor)
+            return StreamingResponse(
+                _stream_projects(ru_category, status, limit, cursor, selected, lang),
+                media_type="application/x-ndjson",
+            )
         
-        # Добавим переводы категорий в ответ
-        projects_data = []
-        for project in projects:
-            project_dict = {
-                "id": project.id,
-                "title": project.title,
-                "title_en": project.title_en,
-                "category": project.category,
-                "category_en": CATEGORY_TRANSLATIONS.get(project.category, project.category),
-                "status": project.status,
-                "status_en": STATUS_TRANSLATIONS.get(project.status, project.status),
-                "year": project.year,
-                "image": project.image,
-                "description": project.description,
-                "description_en": project.description_en,
-                "client": project.client,
-                "role": project.role,
-                "images": project.images,
-                "created_at": project.created_at,
-                "updated_at": project.updated_at,
-            }
-            projects_data.append(project_dict)
-        
-        return {
-            "projects": projects_data,
-            "total": total
-        }
+        key = projects_key(ru_category, status, limit, lang, cursor, include_total, selected)
+        cached = await catalog_cache.get_or_load(
+            key, lambda: _load_projects(ru_category, status, limit, cursor, include_total, selected, lang)
+        )
+        return cached_response(request, cached)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error fetching projects: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/api/projects/{project_id}", response_model=ProjectResponse)
-async def get_project(project_id: int):
+async def _load_projects(
+    category: Optional[str],
+    status: Optional[str],
+    limit: Optional[int],
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    fields: Optional[tuple] = None,
+    lang: Optional[str] = None,
+) -> CachedBody:
+    """
+    Fetch a filtered page of projects from the database
+    
+    With **fields** only the needed columns are selected via ``.values()``;
+    with **lang** only the text columns of that language are fetched.
+    """
+    query = _filtered_projects(category, status)
+    
+    # Get total count
+    total = await query.count() if include_total else None
+    
+    page = query.order_by(*ORDERING)
+    if cursor:
+        page = apply_cursor(page, cursor)
+    
+    # Apply limit; лишняя строка показывает, есть ли следующая страница
+    if limit:
+        page = page.limit(limit + 1)
+    
+    rows = await _fetch_rows(page, fields, lang)
+    
+    next_cursor = None
+    if limit and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(*_row_position(rows[-1]))
+    
+    # Добавим переводы категорий в ответ
+    projects_data = _rows_to_data(rows, fields, lang)
+    if fields is None:
+        model = ProjectListResponse
+    elif lang:
+        model = {
+            LOCALIZED_FIELDS: LocalizedProjectListResponse,
+            LOCALIZED_VIEWS["summary"]: LocalizedProjectSummaryListResponse,
+        }.get(fields)
+    else:
+        model = ProjectSummaryListResponse if fields == SUMMARY_FIELDS else None
+    
+    data = {
+        "projects": projects_data,
+        "total": total,
+        "next_cursor": next_cursor,
+    }
+    if lang:
+        data["lang"] = lang
+    return serialize(data, model)
+
+
+async def _stream_projects(
+    category: Optional[str],
+    status: Optional[str],
+    limit: Optional[int],
+    cursor: Optional[str],
+    fields: Optional[tuple],
+    lang: Optional[str],
+) -> AsyncIterator[bytes]:
+    """Yield matching projects as NDJSON, one database chunk at a time"""
+    chunks = iter_chunks(
+        _filtered_projects(category, status),
+        lambda page: _fetch_rows(page, fields, lang),
+        _row_position,
+        cursor=cursor,
+        limit=limit,
+    )
+    async for rows in chunks:
+        yield b"".join(encode_json(item) + b"\n" for item in _rows_to_data(rows, fields, lang))
+
+
+def _filtered_projects(category: Optional[str], status: Optional[str]) -> QuerySet:
+    query = Project.all()
+    if category:
+        query = query.filter(category=category)
+    if status:
+        query = query.filter(status=status)
+    return query
+
+
+async def _fetch_rows(page: QuerySet, fields: Optional[tuple], lang: Optional[str]) -> list:
+    """Run a page query selecting only the columns needed for the response"""
+    if fields is None:
+        # Словари вместо моделей: не создаем объект Project на каждую строку
+        return await page.values(*PROJECT_COLUMNS)
+    if lang:
+        return await localized_values(page, lang, fields + ("id", "created_at"))
+    return await page.values(*columns_for(fields, extra=("id", "created_at")))
+
+
+def _row_position(row: dict) -> tuple:
+    return row["created_at"], row["id"]
+
+
+def _rows_to_data(rows: list, fields: Optional[tuple], lang: Optional[str]) -> list:
+    if fields is None:
+        return [project_to_dict(row) for row in rows]
+    if lang:
+        return localize_rows(rows, lang, fields)
+    return [row_to_dict(row, fields) for row in rows]
+
+
+@app.get("/api/projects/search", response_model=ProjectSearchResponse)
+async def search(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=200, description="Search query"),
+    limit: int = Query(20, ge=1, le=100, description="Page size"),
+    offset: int = Query(0, ge=0, description="Number of results to skip"),
+):
+    """
+    Full-text search over project titles, descriptions, client and role (RU and EN)
+    
+    - **q**: Search query
+    - **limit** / **offset**: Pagination over ranked results
+    """
+    try:
+        query = " ".join(q.split())
+        cached = await catalog_cache.get_or_load(
+            search_key(query, limit, offset), lambda: _load_search(query, limit, offset)
+        )
+        return cached_response(request, cached)
+    except Exception as e:
+        logger.error(f"Error searching projects: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def _load_search(query: str, limit: int, offset: int) -> CachedBody:
+    """Run a search and fetch the matching projects in rank order"""
+    # С FAST_START индекс SQLite может еще строиться
+    await warmup.wait("search_index")
+    ids, total = await search_projects(query, limit, offset)
+    rows = await Project.filter(id__in=ids).values(*PROJECT_COLUMNS) if ids else []
+    projects = {row["id"]: row for row in rows}
+    return serialize({
+        "query": query,
+        "projects": [project_to_dict(projects[pid]) for pid in ids if pid in projects],
+        "total": total,
+        "limit": limit,
+        "offset": offset,
+    }, ProjectSearchResponse)
+
+
+async def _after_bulk_write() -> None:
+    """Drop cached catalog data and refresh the search index after a batch write"""
+    await invalidation_channel.catalog_changed()
+    await reindex_projects()
+
+
+@app.post("/api/projects/bulk", response_model=BulkWriteResponse)
+async def bulk_upsert_projects(data: ProjectBulkRequest, background_tasks: BackgroundTasks):
+    """
+    Create or update many projects in one transaction
+    
+    Projects with an existing **id** are updated, all others are created.
+    """
+    try:
+        created, updated, project_ids = await upsert_projects(
+            item.model_dump(exclude={"category_en", "status_en"}) for item in data.projects
+        )
+        await _after_bulk_write()
+        background_tasks.add_task(process_missing_images, project_ids)
+        return {"created": created, "updated": updated}
+    except Exception as e:
+        logger.error(f"Error in bulk upsert: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/api/projects/bulk-delete", response_model=BulkWriteResponse)
+async def bulk_delete_projects(data: ProjectBulkDeleteRequest):
+    """Delete many projects by id with a single statement"""
+    try:
+        deleted = await delete_projects(data.ids)
+        await _after_bulk_write()
+        return {"deleted": deleted}
+    except Exception as e:
+        logger.error(f"Error in bulk delete: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/api/projects/export")
+async def export_projects():
+    """Stream the whole catalog as NDJSON (one project per line)"""
+    return StreamingResponse(
+        export_ndjson(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="projects.ndjson"'},
+    )
+
+
+@app.post(
+    "/api/projects/import",
+    response_model=ImportResponse,
+    responses={400: {"model": ImportResponse}, 500: {"model": ImportResponse}},
+)
+async def import_projects(request: Request, background_tasks: BackgroundTasks):
+    """
+    Import projects from an NDJSON request body
+    
+    Lines are upserted in batches, one transaction per batch. Lines from
+    `/api/projects/export` can be imported as is. If a line is invalid or a
+    batch fails, the batches before it stay written: the error response
+    carries their counts, `failed_line` and `error`, and images of the
+    written projects are still processed.
+    """
+    created = updated = 0
+    project_ids = []
+    batch = []
+    line_number = 0
+    # Строка, на которой остановится импорт при ошибке: сама строка при разборе, первая строка пакета при записи
+    failed_line = None
+    try:
+        async for line in iter_lines(request.stream()):
+            line_number += 1
+            failed_line = line_number
+            item = ProjectBulkItem.model_validate_json(line)
+            batch.append(item.model_dump(exclude={"category_en", "status_en"}))
+            if len(batch) >= BATCH_SIZE:
+                failed_line = line_number - len(batch) + 1
+                batch_created, batch_updated, batch_ids = await upsert_projects(batch)
+                created, updated = created + batch_created, updated + batch_updated
+                project_ids += batch_ids
+                batch = []
+        if batch:
+            failed_line = line_number - len(batch) + 1
+            batch_created, batch_updated, batch_ids = await upsert_projects(batch)
+            created, updated = created + batch_created, updated + batch_updated
+            project_ids += batch_ids
+        return {"created": created, "updated": updated}
+    except ValidationError as e:
+        status_code, error = 400, f"Invalid project on line {failed_line}: {e}"
+    except Exception as e:
+        logger.error(f"Error importing projects: {e}")
+        status_code, error = 500, str(e)
+    finally:
+        if created or updated:
+            await _after_bulk_write()
+            background_tasks.add_task(process_missing_images, project_ids)
+    # Записанные пакеты не откатываются: ответ с ошибкой сообщает, сколько успело записаться.
+    # Фоновые задачи FastAPI подключает и к возвращённому JSONResponse
+    result = ImportResponse(created=created, updated=updated, failed_line=failed_line, error=error)
+    return JSONResponse(status_code=status_code, content=result.model_dump())
+
+
+@app.get("/api/projects/{project_id}", response_model=Union[ProjectResponse, LocalizedProjectResponse])
+async def get_project(
+    request: Request,
+    project_id: int,
+    lang: Optional[str] = Query(None, description="Language code (ru/en); omit to get both languages"),
+):
     """
     Get a specific project by ID
     
     - **project_id**: The ID of the project
+    - **lang**: Return title, description, category and status in one language (ru/en)
     """
     try:
-        project = await Project.get_or_none(id=project_id)
+        lang = check_lang(lang)
+        cached = await catalog_cache.get_or_load(
+            project_key(project_id, lang), lambda: _load_project(project_id, lang)
+        )
         
-        if not project:
+        if not cached:
             raise HTTPException(status_code=404, detail="Project not found")
         
-        # Добавим переводы
-        project_dict = {
-            "id": project.id,
-            "title": project.title,
-            "title_en": project.title_en,
-            "category": project.category,
-            "category_en": CATEGORY_TRANSLATIONS.get(project.category, project.category),
-            "status": project.status,
-            "status_en": STATUS_TRANSLATIONS.get(project.status, project.status),
-            "year": project.year,
-            "image": project.image,
-            "description": project.description,
-            "description_en": project.description_en,
-            "client": project.client,
-            "role": project.role,
-            "images": project.images,
-            "created_at": project.created_at,
-            "updated_at": project.updated_at,
-        }
-        
-        return project_dict
+        return cached_response(request, cached)
     except HTTPException:
         raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error fetching project {project_id}: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _load_project(project_id: int, lang: Optional[str] = None) -> Optional[CachedBody]:
+    """Fetch a single project from the database"""
+    if lang:
+        rows = await localized_values(Project.filter(id=project_id), lang, LOCALIZED_FIELDS)
+        if not rows:
+            return None
+        project_dict = localize_rows(rows, lang, LOCALIZED_FIELDS)[0]
+        return serialize(project_dict, LocalizedProjectResponse, last_modified=project_dict["updated_at"])
+    
+    rows = await Project.filter(id=project_id).values(*PROJECT_COLUMNS)
+    if not rows:
+        return None
+    # Добавим переводы
+    return serialize(project_to_dict(rows[0]), ProjectResponse, last_modified=rows[0]["updated_at"])
+
+
+@app.get(
+    "/api/projects/{project_id}/related",
+    response_model=Union[RelatedProjectsResponse, LocalizedRelatedProjectsResponse],
+)
+async def get_related_projects(
+    request: Request,
+    project_id: int,
+    limit: int = Query(4, ge=1, le=20, description="Number of similar projects"),
+    lang: Optional[str] = Query(None, description="Language code (ru/en); omit to get both languages"),
+):
+    """
+    Previous/next project in the list order and the most similar projects
+
+    - **project_id**: The ID of the project
+    - **limit**: How many similar projects to return
+    - **lang**: Return titles, categories and statuses in one language (ru/en)
+
+    Projects are returned in the summary view. Similarity takes the category,
+    client, role and shared words of titles and descriptions into account.
+    The answer comes from an in-process index; no queries are run.
+    """
+    try:
+        lang = check_lang(lang)
+        cached = await catalog_cache.get_or_load(
+            related_key(project_id, lang, limit), lambda: _load_related(project_id, lang, limit)
+        )
+
+        if not cached:
+            raise HTTPException(status_code=404, detail="Project not found")
+
+        return cached_response(request, cached)
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error fetching related projects for {project_id}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def _load_related(project_id: int, lang: Optional[str], limit: int) -> Optional[CachedBody]:
+    """Build the related projects response from the in-process index"""
+    # С FAST_START индекс может еще строиться; записи применяются в фоне
+    await warmup.wait("related_index")
+    await related_index.sync()
+    if project_id not in related_index:
+        return None
+
+    previous_id, next_id = related_index.neighbours(project_id)
+    related_ids = [other_id for other_id, _ in related_index.similar(project_id, limit)]
+    ids = [i for i in (previous_id, next_id) if i is not None] + related_ids
+    rows = [related_index.row(i) for i in ids]
+    if lang:
+        items = localize_rows(rows, lang, LOCALIZED_VIEWS["summary"])
+    else:
+        items = [row_to_dict(row, SUMMARY_FIELDS) for row in rows]
+    summaries = dict(zip(ids, items))
+
+    return serialize({
+        "id": project_id,
+        "previous": summaries.get(previous_id),
+        "next": summaries.get(next_id),
+        "related": [summaries[i] for i in related_ids],
+    }, LocalizedRelatedProjectsResponse if lang else RelatedProjectsResponse)
+
+
 @app.post("/api/projects", response_model=ProjectResponse, status_code=201)
-async def create_project(project_data: ProjectCreate):
+async def create_project(request: Request, project_data: ProjectCreate, background_tasks: BackgroundTasks):
     """
     Create a new project
     
@@ -188,7 +664,16 @@ async def create_project(project_data: ProjectCreate):
     """
     try:
         project = await Project.create(**project_data.model_dump())
-        return project
+        audit_log.created(project.id, project_values(project))
+        await invalidation_channel.project_changed(project.id, [project.category], [project.status])
+        index_project(project)
+        
+        # Сразу сохраняем готовое тело ответа для GET /api/projects/{id}
+        cached = _serialize_project(project)
+        catalog_cache.set(project_key(project.id), cached)
+        # Размеры и варианты картинок считаются после ответа
+        background_tasks.add_task(process_project_images, project.id)
+        return cached_response(request, cached, status_code=201)
     except Exception as e:
         logger.error(f"Error creating project: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -196,7 +681,12 @@ async def create_project(project_data: ProjectCreate):
 
 @app.put("/api/projects/{project_id}", response_model=ProjectResponse)
 @app.patch("/api/projects/{project_id}", response_model=ProjectResponse)
-async def update_project(project_id: int, project_data: ProjectUpdate):
+async def update_project(
+    request: Request,
+    project_id: int,
+    project_data: ProjectUpdate,
+    background_tasks: BackgroundTasks,
+):
     """
     Update an existing project
     
@@ -209,11 +699,27 @@ async def update_project(project_id: int, project_data: ProjectUpdate):
         if not project:
             raise HTTPException(status_code=404, detail="Project not found")
         
+        old_category, old_status = project.category, project.status
+        old_values = project_values(project)
+        
         # Update only provided fields
         update_data = project_data.model_dump(exclude_unset=True)
         await project.update_from_dict(update_data).save()
+        audit_log.updated(project_id, old_values, project_values(project))
         
-        return project
+        await invalidation_channel.project_changed(
+            project_id,
+            [old_category, project.category],
+            [old_status, project.status],
+            counts_changed=old_category != project.category,
+        )
+        index_project(project)
+        
+        cached = _serialize_project(project)
+        catalog_cache.set(project_key(project_id), cached)
+        if "image" in update_data or "images" in update_data:
+            background_tasks.add_task(process_project_images, project_id)
+        return cached_response(request, cached)
     except HTTPException:
         raise
     except Exception as e:
@@ -235,6 +741,9 @@ async def delete_project(project_id: int):
             raise HTTPException(status_code=404, detail="Project not found")
         
         await project.delete()
+        audit_log.deleted(project_id, project_values(project))
+        await invalidation_channel.project_changed(project_id, [project.category], [project.status])
+        unindex_project(project_id)
         
         return {"message": f"Project {project_id} deleted successfully"}
     except HTTPException:
@@ -245,39 +754,133 @@ async def delete_project(project_id: int):
 
 
 @app.get("/api/categories")
-async def get_categories(lang: Optional[str] = Query("ru", description="Language code (ru/en)")):
+async def get_categories(
+    request: Request,
+    lang: Optional[str] = Query("ru", description="Language code (ru/en)"),
+):
     """Get all available categories with project counts"""
     try:
-        all_count = await Project.all().count()
-        design_count = await Project.filter(category="Дизайн").count()
-        dev_count = await Project.filter(category="Разработка").count()
-        startup_count = await Project.filter(category="Стартапы").count()
-        other_count = await Project.filter(category="Другое").count()
-        
-        if lang == "en":
-            categories = [
-                {"name": "All", "name_ru": "Все", "count": all_count},
-                {"name": "Design", "name_ru": "Дизайн", "count": design_count},
-                {"name": "Development", "name_ru": "Разработка", "count": dev_count},
-                {"name": "Startups", "name_ru": "Стартапы", "count": startup_count},
-                {"name": "Other", "name_ru": "Другое", "count": other_count},
-            ]
-        else:
-            categories = [
-                {"name": "Все", "name_en": "All", "count": all_count},
-                {"name": "Дизайн", "name_en": "Design", "count": design_count},
-                {"name": "Разработка", "name_en": "Development", "count": dev_count},
-                {"name": "Стартапы", "name_en": "Startups", "count": startup_count},
-                {"name": "Другое", "name_en": "Other", "count": other_count},
-            ]
-        
-        return {"categories": categories}
+        cached = await catalog_cache.get_or_load(
+            categories_key(lang), lambda: _load_categories(lang)
+        )
+        return cached_response(request, cached)
     except Exception as e:
         logger.error(f"Error fetching categories: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _load_categories(lang: Optional[str]) -> CachedBody:
+    """Count projects per category with a single GROUP BY query"""
+    rows = await (
+        Project.annotate(count=Count("id"))
+        .group_by("category")
+        .values("category", "count")
+    )
+    counts = {getattr(row["category"], "value", row["category"]): row["count"] for row in rows}
+    
+    all_count = sum(counts.values())
+    if lang == "en":
+        categories = [{"name": "All", "name_ru": "Все", "count": all_count}]
+        categories += [
+            {"name": CATEGORY_TRANSLATIONS[c.value], "name_ru": c.value, "count": counts.get(c.value, 0)}
+            for c in CategoryEnum
+        ]
+    else:
+        categories = [{"name": "Все", "name_en": "All", "count": all_count}]
+        categories += [
+            {"name": c.value, "name_en": CATEGORY_TRANSLATIONS[c.value], "count": counts.get(c.value, 0)}
+            for c in CategoryEnum
+        ]
+    
+    return serialize({"categories": categories})
+
+
+@app.get("/api/changes", response_model=ChangeFeedResponse)
+async def get_changes(
+    since: int = Query(0, ge=0, description="Return changes after this change id (next_since of the previous page)"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of changes"),
+):
+    """
+    Feed of project writes for incremental sync, oldest first
+
+    Poll with the returned **next_since** to get only new changes. Events are
+    written in batches, so a change shows up here up to
+    ``AUDIT_FLUSH_INTERVAL`` seconds after the write. Batches of different
+    workers appear in the order they were committed, which is not always the
+    order of the writes themselves.
+    """
+    try:
+        rows = await (
+            ProjectChange.filter(id__gt=since)
+            .order_by("id")
+            .limit(limit + 1)
+            .values("id", "project_id", "operation", "changes", "created_at")
+        )
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        return {
+            "changes": rows,
+            "next_since": rows[-1]["id"] if rows else since,
+            "has_more": has_more,
+        }
+    except Exception as e:
+        logger.error(f"Error fetching changes since {since}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/api/cache/stats", response_model=CacheStatsResponse)
+async def cache_stats():
+    """Hit/miss counters of the catalog cache"""
+    return catalog_cache.stats()
+
+
+@app.get("/api/db/pool", response_model=PoolStatsResponse)
+async def db_pool_stats(
+    connection: str = Query(PRIMARY, description="Connection name: default or replica_N")
+):
+    """Connection pool usage: open, idle and busy connections and waiting requests"""
+    if connection != PRIMARY and connection not in REPLICAS:
+        raise HTTPException(status_code=404, detail="Connection not found")
+    return pool_stats(connection)
+
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    """Request, database and cache metrics in Prometheus text format"""
+    cache = catalog_cache.stats()
+    extra = [
+        ("catalog_cache_hits_total", "counter", "Catalog cache hits", cache["hits"]),
+        ("catalog_cache_misses_total", "counter", "Catalog cache misses", cache["misses"]),
+        ("catalog_cache_evictions_total", "counter", "Catalog cache LRU evictions", cache["evictions"]),
+        ("catalog_cache_entries", "gauge", "Entries in the catalog cache", cache["size"]),
+        ("catalog_cache_coalesced_total", "counter", "Requests that shared an in-flight load", cache["coalesced"]),
+        ("catalog_cache_in_flight", "gauge", "Catalog loads in progress", cache["in_flight"]),
+    ]
+    channel = invalidation_channel.stats()
+    extra += [
+        ("cache_invalidations_sent_total", "counter", "Invalidations broadcast to other workers", channel["sent"]),
+        ("cache_invalidations_received_total", "counter", "Invalidations received from other workers", channel["received"]),
+    ]
+    audit = audit_log.stats()
+    extra += [
+        ("audit_events_pending", "gauge", "Audit log events waiting to be written", audit["pending"]),
+    ]
+    pool = pool_stats()
+    for key, kind, documentation in (
+        ("size", "gauge", "Open database connections"),
+        ("in_use", "gauge", "Database connections in use"),
+        ("idle", "gauge", "Idle database connections"),
+        ("waiting", "gauge", "Requests waiting for a database connection"),
+        ("acquire_timeouts", "counter", "Connection acquire timeouts"),
+    ):
+        if pool.get(key) is not None:
+            suffix = "_total" if kind == "counter" else ""
+            extra.append((f"db_pool_{key}{suffix}", kind, documentation, pool[key]))
+    return PlainTextResponse(registry.render(extra), media_type="text/plain; version=0.0.4")
+
+
 if __name__ == "__main__":
+    # Режим разработки; в продакшне: python -m app.server
     import uvicorn
     uvicorn.run(
         "app.main:app",
@@ -0,0 +1,268 @@
+"""
+Request latency and database query metrics in Prometheus text format
+"""
+import functools
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from tortoise.backends.base.client import BaseDBAsyncClient
+
+# Границы корзин гистограмм в секундах
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+RATIO_BUCKETS = (0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0)
+
+QUERY_METHODS = (
+    "execute_query",
+    "execute_query_dict",
+    "execute_insert",
+    "execute_many",
+    "execute_script",
+)
+
+LabelValues = Tuple[str, ...]
+
+
+class Counter:
+    """Monotonic counter with labels"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1.0) -> None:
+        self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def samples(self) -> List[Tuple[str, LabelValues, float]]:
+        return [(self.name, key, value) for key, value in sorted(self._values.items())]
+
+
+class Histogram:
+    """Cumulative histogram with labels"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Iterable[str] = (),
+        buckets: Iterable[float] = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        # По каждому набору меток: счетчики корзин (+Inf последней), сумма, количество
+        self._values: Dict[LabelValues, list] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        entry = self._values.get(label_values)
+        if entry is None:
+            entry = self._values[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        entry[0][bisect_left(self.buckets, value)] += 1
+        entry[1] += value
+        entry[2] += 1
+
+    def samples(self) -> List[Tuple[str, LabelValues, float]]:
+        result = []
+        for key, (counts, total, count) in sorted(self._values.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                result.append((f"{self.name}_bucket", key + (le,), cumulative))
+            result.append((f"{self.name}_sum", key, total))
+            result.append((f"{self.name}_count", key, count))
+        return result
+
+
+class Registry:
+    """Collection of metrics rendered together at /metrics"""
+
+    def __init__(self):
+        self._metrics: List = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self, extra: Iterable[Tuple[str, str, str, float]] = ()) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format
+
+        - **extra**: (name, type, help, value) gauges computed at scrape time
+        """
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            label_names = metric.labels + (("le",) if metric.kind == "histogram" else ())
+            for sample_name, label_values, value in metric.samples():
+                lines.append(f"{sample_name}{_format_labels(label_names, label_values)} {_format_value(value)}")
+        for name, kind, documentation, value in extra:
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.append(f"{name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(names: Tuple[str, ...], values: LabelValues) -> str:
+    if not values:
+        return ""
+    pairs = []
+    for name, value in zip(names, values):
+        escaped = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        pairs.append(f'{name}="{escaped}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+registry = Registry()
+
+http_requests_total = registry.register(Counter(
+    "http_requests_total", "HTTP requests by route and status code", ("method", "route", "status"),
+))
+http_request_duration = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ("method", "route"),
+))
+http_request_db_queries = registry.register(Histogram(
+    "http_request_db_queries", "Database queries executed per HTTP request", ("method", "route"),
+    buckets=COUNT_BUCKETS,
+))
+http_request_db_duration = registry.register(Histogram(
+    "http_request_db_duration_seconds", "Time spent in database queries per HTTP request", ("method", "route"),
+))
+db_queries_total = registry.register(Counter(
+    "db_queries_total", "Database queries by client method", ("operation",),
+))
+db_query_duration = registry.register(Histogram(
+    "db_query_duration_seconds", "Database query latency", ("operation",),
+))
+serialization_duration = registry.register(Histogram(
+    "serialization_duration_seconds", "Time spent serializing response bodies", ("schema",),
+))
+compression_duration = registry.register(Histogram(
+    "http_response_compression_seconds", "CPU time spent compressing response bodies", ("encoding",),
+))
+compression_ratio = registry.register(Histogram(
+    "http_response_compression_ratio", "Compressed size divided by original size", ("encoding",),
+    buckets=RATIO_BUCKETS,
+))
+compression_bytes = registry.register(Counter(
+    "http_response_compression_bytes_total", "Response bytes before and after compression", ("encoding", "stage"),
+))
+compression_cache = registry.register(Counter(
+    "http_response_compression_cache_total", "Lookups of stored compressed bodies", ("result",),
+))
+audit_events = registry.register(Counter(
+    "audit_events_total", "Audit log events by outcome (written, failed, dropped)", ("result",),
+))
+rate_limited = registry.register(Counter(
+    "http_requests_rate_limited_total", "Requests rejected by the per-IP rate limit", ("method",),
+))
+
+
+class RequestStats:
+    """Per-request database counters"""
+
+    __slots__ = ("queries", "query_time")
+
+    def __init__(self):
+        self.queries = 0
+        self.query_time = 0.0
+
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+_inside_query: ContextVar[bool] = ContextVar("inside_query", default=False)
+
+
+def _instrument_method(method):
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        # Методы клиента вызывают друг друга; считаем только внешний вызов
+        if _inside_query.get():
+            return await method(self, *args, **kwargs)
+        token = _inside_query.set(True)
+        start = time.perf_counter()
+        try:
+            return await method(self, *args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            _inside_query.reset(token)
+            db_queries_total.inc(method.__name__)
+            db_query_duration.observe(elapsed, method.__name__)
+            stats = _request_stats.get()
+            if stats is not None:
+                stats.queries += 1
+                stats.query_time += elapsed
+
+    wrapper._metrics_instrumented = True
+    return wrapper
+
+
+def _instrument_class(cls) -> None:
+    for name in QUERY_METHODS:
+        method = cls.__dict__.get(name)
+        if method is not None and not getattr(method, "_metrics_instrumented", False):
+            setattr(cls, name, _instrument_method(method))
+    for subclass in cls.__subclasses__():
+        _instrument_class(subclass)
+
+
+def instrument_db() -> None:
+    """
+    Wrap query methods of every loaded Tortoise client class
+
+    Call after ``Tortoise.init`` so that the backend client (and its
+    transaction wrapper) is already imported.
+    """
+    _instrument_class(BaseDBAsyncClient)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency, status codes and DB queries per route"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            _request_stats.reset(token)
+            route = scope.get("route")
+            # Шаблон пути, а не конкретный URL, чтобы не плодить метки
+            route_path = getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+            http_requests_total.inc(method, route_path, str(status_code))
+            http_request_duration.observe(elapsed, method, route_path)
+            http_request_db_queries.observe(stats.queries, method, route_path)
+            http_request_db_duration.observe(stats.query_time, method, route_path)
@@ -51,6 +51,8 @@ class Project(Model):
     client = fields.CharField(max_length=255, null=True)
     role = fields.CharField(max_length=255, null=True)
     images = fields.JSONField(default=list)  # Array of additional image URLs
+    # Размеры, blurhash и варианты картинок по URL; заполняет app.images
+    media = fields.JSONField(default=dict)
     
     # Английские переводы
     title_en = fields.CharField(max_length=255, null=True)
@@ -62,6 +64,35 @@ class Project(Model):
     class Meta:
         table = "projects"
         ordering = ["-created_at"]
+        # Индексы для фильтров и сортировки списка заданы в migrations/models:
+        # Tortoise не умеет описывать индексы с DESC и по выражению
     
     def __str__(self):
         return f"{self.title} ({self.year})"
+
+
+class ChangeOperation(str, Enum):
+    CREATE = "create"
+    UPDATE = "update"
+    DELETE = "delete"
+
+
+class ProjectChange(Model):
+    """
+    Append-only log of project writes, filled by app.audit
+    """
+    id = fields.BigIntField(pk=True)
+    # Без внешнего ключа: записи об удаленных проектах остаются
+    project_id = fields.IntField()
+    operation = fields.CharEnumField(ChangeOperation, max_length=10)
+    # {поле: [старое значение, новое значение]}
+    changes = fields.JSONField(default=dict)
+    created_at = fields.DatetimeField()  # time of the write, not of the insert
+    
+    class Meta:
+        table = "project_changes"
+        # Лента /api/changes читается по id, его индекса достаточно
+        ordering = ["id"]
+    
+    def __str__(self):
+        return f"{self.operation} project {self.project_id}"
@@ -0,0 +1,76 @@
+"""
+Keyset pagination over the (-created_at, id) ordering
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Optional, Tuple
+
+from tortoise.expressions import Q
+from tortoise.queryset import QuerySet
+
+# Порядок сортировки списка: новые проекты первыми, id разрешает совпадения
+ORDERING = ("-created_at", "id")
+
+# Размер порции при потоковой выдаче
+CHUNK_SIZE = 200
+
+
+def encode_cursor(created_at: datetime, project_id: int) -> str:
+    """Pack the position of the last returned row into an opaque string"""
+    raw = json.dumps([created_at.isoformat(), project_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Unpack a cursor produced by ``encode_cursor``; raises ValueError if malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, project_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), int(project_id)
+    except (TypeError, ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def apply_position(query: QuerySet, created_at: datetime, project_id: int) -> QuerySet:
+    """Restrict the query to rows that come after the given position"""
+    return query.filter(
+        Q(created_at__lt=created_at) | Q(created_at=created_at, id__gt=project_id)
+    )
+
+
+def apply_cursor(query: QuerySet, cursor: str) -> QuerySet:
+    """Restrict the query to rows that come after ``cursor``"""
+    return apply_position(query, *decode_cursor(cursor))
+
+
+async def iter_chunks(
+    query: QuerySet,
+    fetch: Callable[[QuerySet], Awaitable[List[Any]]],
+    position: Callable[[Any], Tuple[datetime, int]],
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> AsyncIterator[List[Any]]:
+    """
+    Walk the query in keyset order, one chunk of rows at a time
+
+    - **fetch**: runs a page query and returns its rows (model instances or ``.values()`` dicts)
+    - **position**: returns (created_at, id) of a row
+    - **limit**: stop after this many rows in total
+    """
+    page = query.order_by(*ORDERING)
+    if cursor:
+        page = apply_cursor(page, cursor)
+    remaining = limit
+    while remaining is None or remaining > 0:
+        size = chunk_size if remaining is None else min(chunk_size, remaining)
+        rows = await fetch(page.limit(size))
+        if not rows:
+            return
+        yield rows
+        if len(rows) < size:
+            return
+        if remaining is not None:
+            remaining -= len(rows)
+        page = apply_position(query.order_by(*ORDERING), *position(rows[-1]))
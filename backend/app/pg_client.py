@@ -0,0 +1,72 @@
+"""
+Tortoise engine for PostgreSQL with a bounded pool acquire and pool statistics
+
+Used as ``"engine": "app.pg_client"`` in the Tortoise config. It behaves like
+``tortoise.backends.asyncpg`` but waits at most ``acquire_timeout`` seconds
+for a free connection and counts the tasks waiting for one.
+"""
+import asyncio
+from typing import Optional
+
+from tortoise.backends.asyncpg.client import AsyncpgDBClient
+
+
+class PoolExhaustedError(Exception):
+    """No connection became free within the acquire timeout"""
+
+
+class _TimedAcquire:
+    __slots__ = ("client", "wrapper")
+
+    def __init__(self, client: "AsyncpgClient", wrapper):
+        self.client = client
+        self.wrapper = wrapper
+
+    async def __aenter__(self):
+        client = self.client
+        client.waiting += 1
+        try:
+            return await asyncio.wait_for(self.wrapper.__aenter__(), client.acquire_timeout)
+        except asyncio.TimeoutError:
+            client.acquire_timeouts += 1
+            raise PoolExhaustedError(
+                f"No database connection available within {client.acquire_timeout}s "
+                f"(pool max size {client.pool_maxsize})"
+            ) from None
+        finally:
+            client.waiting -= 1
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return await self.wrapper.__aexit__(exc_type, exc_val, exc_tb)
+
+
+class AsyncpgClient(AsyncpgDBClient):
+    def __init__(self, *args, acquire_timeout: Optional[float] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.acquire_timeout = float(acquire_timeout) if acquire_timeout else None
+        self.waiting = 0
+        self.acquire_timeouts = 0
+
+    def acquire_connection(self):
+        wrapper = super().acquire_connection()
+        if self.acquire_timeout is None:
+            return wrapper
+        return _TimedAcquire(self, wrapper)
+
+    def pool_stats(self) -> dict:
+        """Live pool counters"""
+        pool = self._pool
+        size = pool.get_size() if pool else 0
+        idle = pool.get_idle_size() if pool else 0
+        return {
+            "min_size": self.pool_minsize,
+            "max_size": self.pool_maxsize,
+            "size": size,
+            "idle": idle,
+            "in_use": size - idle,
+            "waiting": self.waiting,
+            "acquire_timeouts": self.acquire_timeouts,
+        }
+
+
+client_class = AsyncpgClient
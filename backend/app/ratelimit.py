@@ -0,0 +1,112 @@
+"""
+Per-client rate limiting with token buckets
+
+Every client IP has a bucket of ``RATE_LIMIT_BURST`` tokens refilled at
+``RATE_LIMIT_RATE`` tokens per second; a request to ``/api/`` takes one token
+and is rejected with 429 when the bucket is empty. The client is identified by
+``X-Real-IP``, which nginx sets to the peer address (the backend is only
+reachable through nginx); direct requests use the socket address.
+
+Buckets live in the worker process, so with several workers a client gets up
+to ``WORKERS`` times the configured rate. Requests the application sends to
+itself (the snapshot render) are not limited.
+"""
+import math
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from app.asgi import is_internal
+from app.config import settings
+from app.metrics import rate_limited
+
+LIMITED_PREFIX = "/api/"
+# Проверки оркестратора не должны упираться в лимит
+EXEMPT_PATHS = ("/api/health", "/api/ready")
+
+
+class TokenBucketLimiter:
+    """Token buckets keyed by client, least recently used dropped beyond ``max_clients``"""
+
+    def __init__(self, rate: float, burst: int, max_clients: int = 10000):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()
+
+    def acquire(self, client: str, now: Optional[float] = None) -> float:
+        """
+        Take a token for ``client``
+
+        Returns 0 when the request is allowed, otherwise the number of seconds
+        until a token becomes available.
+        """
+        if now is None:
+            now = time.monotonic()
+        bucket = self._buckets.get(client)
+        if bucket is None:
+            # [токены, время последнего пополнения]
+            bucket = self._buckets[client] = [float(self.burst), now]
+            # Выброшенный клиент просто получит полную корзину
+            while len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(client)
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            return 0.0
+        return (1 - bucket[0]) / self.rate if self.rate > 0 else math.inf
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+def client_ip(scope) -> str:
+    for name, value in scope["headers"]:
+        if name == b"x-real-ip":
+            return value.decode("latin-1").strip()
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+class RateLimitMiddleware:
+    """ASGI middleware answering 429 with Retry-After to clients over their limit"""
+
+    def __init__(self, app):
+        self.app = app
+        self.limiter = TokenBucketLimiter(
+            settings.RATE_LIMIT_RATE,
+            settings.RATE_LIMIT_BURST,
+            settings.RATE_LIMIT_MAX_CLIENTS,
+        )
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or not settings.RATE_LIMIT_ENABLED
+            or not scope["path"].startswith(LIMITED_PREFIX)
+            or scope["path"] in EXEMPT_PATHS
+            or is_internal(scope)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        retry_after = self.limiter.acquire(client_ip(scope))
+        if not retry_after:
+            await self.app(scope, receive, send)
+            return
+
+        rate_limited.inc(scope["method"])
+        body = b'{"detail":"Too many requests"}'
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(max(1, math.ceil(min(retry_after, 3600)))).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,253 @@
+"""
+Neighbours and related projects for the project page
+
+``related_index`` keeps the summary columns of every project, the list order
+(``-created_at``, ``id``, as ``app.pagination.ORDERING``) and a sparse feature vector per project: its
+category, client, role words and title/description words. Similarity is the
+cosine of the vectors with IDF-weighted features, so rare shared words count
+more than common ones.
+
+The index is built at startup and follows writes through ``app.invalidation``
+(this worker's and, on PostgreSQL, other workers'): changed projects are
+re-read in the background and requests wait for that, so answering a request
+runs no queries.
+"""
+import asyncio
+import bisect
+import heapq
+import logging
+import math
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+from app.models import Project
+from app.search import tokenize
+from app.serializers import SUMMARY_FIELDS, columns_for
+
+logger = logging.getLogger(__name__)
+
+# Колонки, которые хранятся в индексе для ответа (view=summary)
+SUMMARY_COLUMNS = columns_for(SUMMARY_FIELDS)
+
+# Колонки, из которых считаются признаки
+FEATURE_COLUMNS = ("category", "client", "role", "title", "title_en", "description", "description_en")
+
+INDEX_COLUMNS = tuple(dict.fromkeys(SUMMARY_COLUMNS + FEATURE_COLUMNS + ("created_at",)))
+
+# Вес признака каждого вида; слова текста дополнительно взвешиваются по частоте
+FEATURE_WEIGHTS = {
+    "category": 3.0,
+    "client": 2.0,
+    "role": 1.5,
+    "text": 1.0,
+}
+
+TEXT_COLUMNS = ("title", "title_en", "description", "description_en")
+MIN_TOKEN_LENGTH = 3  # короткие слова (предлоги, союзы) не сближают проекты
+
+# Признаки, которые есть у большего числа проектов (категория в большом
+# каталоге, частые слова), только уточняют оценку кандидатов, найденных по
+# более редким признакам; в каталогах меньше этого размера сходство точное
+SCAN_LIMIT = 1000
+
+
+def category_feature(category) -> str:
+    return f"category:{getattr(category, 'value', category)}"
+
+
+def project_features(row: dict) -> Dict[str, float]:
+    """Sparse feature vector of a project row"""
+    features: Dict[str, float] = defaultdict(float)
+    features[category_feature(row["category"])] = FEATURE_WEIGHTS["category"]
+    client = " ".join(tokenize(row.get("client")))
+    if client:
+        features[f"client:{client}"] = FEATURE_WEIGHTS["client"]
+    for token in set(tokenize(row.get("role"))):
+        features[f"role:{token}"] = FEATURE_WEIGHTS["role"]
+    counts = Counter(
+        token
+        for column in TEXT_COLUMNS
+        for token in tokenize(row.get(column))
+        if len(token) >= MIN_TOKEN_LENGTH
+    )
+    for token, count in counts.items():
+        features[f"text:{token}"] = FEATURE_WEIGHTS["text"] * (1 + math.log(count))
+    return dict(features)
+
+
+def _position(row: dict) -> Tuple[float, int]:
+    # timestamp, а не datetime: строки из базы и из моделей могут различаться tzinfo.
+    # -id: по убыванию позиции проекты идут как в списке (-created_at, id)
+    return row["created_at"].timestamp(), -row["id"]
+
+
+class RelatedIndex:
+    """
+    In-process index of list positions and project similarity
+
+    Also an ``app.invalidation`` listener: ``project_changed`` and
+    ``catalog_changed`` schedule a background refresh, ``sync`` waits for it.
+    """
+
+    def __init__(self):
+        self._rows: Dict[int, dict] = {}
+        self._positions: Dict[int, Tuple[float, int]] = {}
+        # Позиции по возрастанию; в списке проекты идут в обратном порядке
+        self._order: List[Tuple[float, int]] = []
+        self._features: Dict[int, Dict[str, float]] = {}
+        self._norms: Dict[int, float] = {}
+        self._postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+        self._dirty: Set[int] = set()
+        self._rebuild = False
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, project_id: int) -> bool:
+        return project_id in self._rows
+
+    def clear(self) -> None:
+        self._rows.clear()
+        self._positions.clear()
+        self._order.clear()
+        self._features.clear()
+        self._norms.clear()
+        self._postings.clear()
+
+    def add(self, row: dict) -> None:
+        """Index a project row (``INDEX_COLUMNS``), replacing its previous version"""
+        project_id = row["id"]
+        self.remove(project_id)
+        self._rows[project_id] = {column: row[column] for column in SUMMARY_COLUMNS}
+        position = self._positions[project_id] = _position(row)
+        bisect.insort(self._order, position)
+        features = self._features[project_id] = project_features(row)
+        self._norms[project_id] = math.sqrt(sum(weight * weight for weight in features.values())) or 1.0
+        for feature, weight in features.items():
+            self._postings[feature][project_id] = weight
+
+    def remove(self, project_id: int) -> None:
+        if self._rows.pop(project_id, None) is None:
+            return
+        position = self._positions.pop(project_id)
+        del self._order[bisect.bisect_left(self._order, position)]
+        for feature in self._features.pop(project_id):
+            postings = self._postings[feature]
+            del postings[project_id]
+            if not postings:
+                del self._postings[feature]
+        del self._norms[project_id]
+
+    def row(self, project_id: int) -> Optional[dict]:
+        """Summary columns of an indexed project"""
+        return self._rows.get(project_id)
+
+    def neighbours(self, project_id: int) -> Tuple[Optional[int], Optional[int]]:
+        """Ids of the previous (newer) and next (older) project in the list order"""
+        i = bisect.bisect_left(self._order, self._positions[project_id])
+        previous = -self._order[i + 1][1] if i + 1 < len(self._order) else None
+        following = -self._order[i - 1][1] if i > 0 else None
+        return previous, following
+
+    def similar(self, project_id: int, limit: int) -> List[Tuple[int, float]]:
+        """Up to ``limit`` (project_id, score) pairs, most similar first"""
+        total = len(self._rows)
+        scores: Dict[int, float] = defaultdict(float)
+        common = []
+        for feature, weight in self._features[project_id].items():
+            postings = self._postings[feature]
+            if len(postings) == 1:
+                continue
+            idf = math.log(1 + total / len(postings))
+            weight *= idf * idf
+            if len(postings) > SCAN_LIMIT:
+                common.append((postings, weight))
+                continue
+            for other_id, other_weight in postings.items():
+                scores[other_id] += weight * other_weight
+        scores.pop(project_id, None)
+
+        if len(scores) < limit:
+            # Мало кандидатов по редким признакам: добавляем проекты той же категории
+            for other_id in self._postings[category_feature(self._rows[project_id]["category"])]:
+                if len(scores) >= limit:
+                    break
+                if other_id != project_id:
+                    scores.setdefault(other_id, 0.0)
+        for postings, weight in common:
+            for other_id in scores:
+                other_weight = postings.get(other_id)
+                if other_weight is not None:
+                    scores[other_id] += weight * other_weight
+
+        norm = self._norms[project_id]
+        # При равном сходстве - в порядке списка
+        return heapq.nsmallest(
+            limit,
+            ((other_id, score / (norm * self._norms[other_id])) for other_id, score in scores.items()),
+            key=lambda item: (-item[1], -self._positions[item[0]][0], item[0]),
+        )
+
+    # Слушатель app.invalidation
+
+    def project_changed(self, project_id: int, categories, statuses, counts_changed: bool) -> None:
+        self._dirty.add(project_id)
+        self._schedule()
+
+    def catalog_changed(self) -> None:
+        self._rebuild = True
+        self._schedule()
+
+    async def build(self) -> None:
+        """Load the whole catalog; called at startup"""
+        self.catalog_changed()
+        await self.sync()
+
+    async def sync(self) -> None:
+        """Wait until the writes reported so far are in the index"""
+        if self._rebuild or self._dirty:
+            # Прошлое обновление не удалось: пробуем снова
+            self._schedule()
+        task = self._task
+        if task is not None and not task.done():
+            # shield: отмена запроса не прерывает обновление индекса
+            await asyncio.wait([asyncio.shield(task)])
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def _schedule(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._refresh())
+
+    async def _refresh(self) -> None:
+        while self._rebuild or self._dirty:
+            rebuild, self._rebuild = self._rebuild, False
+            project_ids, self._dirty = self._dirty, set()
+            try:
+                if rebuild:
+                    rows = await Project.all().values(*INDEX_COLUMNS)
+                    # Запись, пришедшая во время загрузки, будет перечитана отдельно
+                    self.clear()
+                    for row in rows:
+                        self.add(row)
+                    logger.info(f"Related projects index built for {len(self)} projects")
+                else:
+                    rows = await Project.filter(id__in=list(project_ids)).values(*INDEX_COLUMNS)
+                    for row in rows:
+                        self.add(row)
+                    for project_id in project_ids - {row["id"] for row in rows}:
+                        self.remove(project_id)
+            except Exception as e:
+                # Индекс остается прежним; обновление повторит следующий запрос
+                self._rebuild = self._rebuild or rebuild
+                self._dirty |= project_ids
+                logger.error(f"Error refreshing related projects index: {e}")
+                return
+
+
+related_index = RelatedIndex()
@@ -0,0 +1,128 @@
+"""
+Pre-serialized JSON bodies with ETag / 304 support
+"""
+import hashlib
+import time
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Optional, Type
+
+import orjson
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+from app.compression import choose_encoding, compressed_body
+from app.config import settings
+from app.metrics import serialization_duration
+
+
+class CachedBody:
+    """Serialized response body together with its validators"""
+
+    __slots__ = ("body", "etag", "last_modified", "compressed")
+
+    def __init__(self, body: bytes, last_modified: Optional[datetime] = None):
+        self.body = body
+        # Сжатые варианты тела по Content-Encoding; заполняются при первом запросе
+        self.compressed: Dict[str, bytes] = {}
+        # Strong ETag: тело ответа детерминировано для одних и тех же данных
+        self.etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+        if last_modified is not None:
+            if last_modified.tzinfo is None:
+                last_modified = last_modified.replace(tzinfo=timezone.utc)
+            last_modified = last_modified.astimezone(timezone.utc)
+        self.last_modified = last_modified
+
+
+def encode_json(data: Any) -> bytes:
+    """
+    Encode response data to JSON
+
+    Gives the same bytes as pydantic's ``model_dump_json`` for dicts in schema
+    field order, without validating them first.
+    """
+    # OPT_UTC_Z: "2024-01-01T00:00:00Z", как у pydantic, а не "+00:00"
+    return orjson.dumps(data, option=orjson.OPT_UTC_Z)
+
+
+def serialize(
+    data: Any,
+    model: Optional[Type[BaseModel]] = None,
+    last_modified: Optional[datetime] = None,
+) -> CachedBody:
+    """
+    Serialize response data once so it can be reused between requests
+
+    - **model**: response schema the data follows, used to label metrics
+
+    The data is encoded as is, without validation: dicts from
+    ``app.serializers`` already have the fields and order of their schema.
+    """
+    start = time.perf_counter()
+    body = encode_json(data)
+    serialization_duration.observe(time.perf_counter() - start, model.__name__ if model else "json")
+    return CachedBody(body, last_modified)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def _not_modified_since(header: str, last_modified: datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        return False
+    return last_modified.replace(microsecond=0) <= since
+
+
+def cached_response(request: Request, cached: CachedBody, status_code: int = 200) -> Response:
+    """
+    Build a JSON response, answering conditional requests with 304
+
+    The body is compressed according to Accept-Encoding; the compressed form
+    is kept on ``cached`` and reused by later requests.
+    """
+    body = cached.body
+    etag = cached.etag
+    headers = {"Cache-Control": "no-cache"}
+    if settings.COMPRESSION_ENABLED and len(body) >= settings.COMPRESSION_MIN_SIZE:
+        headers["Vary"] = "Accept-Encoding"
+        encoding = choose_encoding(request.headers.get("accept-encoding"))
+        if encoding is not None:
+            body = compressed_body(cached, encoding)
+            # Разные кодировки - разные представления, у каждого свой ETag
+            etag = f'{cached.etag[:-1]}-{encoding}"'
+            headers["Content-Encoding"] = encoding
+    headers["ETag"] = etag
+    if cached.last_modified is not None:
+        headers["Last-Modified"] = format_datetime(cached.last_modified, usegmt=True)
+
+    if status_code == 200:
+        if_none_match = request.headers.get("if-none-match")
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_none_match is not None:
+            not_modified = _etag_matches(if_none_match, etag) or _etag_matches(if_none_match, cached.etag)
+        elif if_modified_since is not None and cached.last_modified is not None:
+            not_modified = _not_modified_since(if_modified_since, cached.last_modified)
+        else:
+            not_modified = False
+        if not_modified:
+            return Response(status_code=304, headers=headers)
+
+    return Response(
+        content=body,
+        status_code=status_code,
+        media_type="application/json",
+        headers=headers,
+    )
@@ -1,8 +1,24 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 from datetime import datetime
 
 
+class ImageVariant(BaseModel):
+    """Resized copy of an image"""
+    url: str
+    width: int
+    height: int
+    format: str = Field(..., description="webp or avif")
+
+
+class ImageMeta(BaseModel):
+    """Metadata of a processed image"""
+    width: int
+    height: int
+    blurhash: str = Field(..., description="Placeholder shown while the image loads")
+    variants: List[ImageVariant] = Field(default_factory=list)
+
+
 class ProjectBase(BaseModel):
     title: str = Field(..., description="Project title")
     category: str = Field(..., description="Project category")
@@ -24,6 +40,22 @@ class ProjectCreate(ProjectBase):
     pass
 
 
+class ProjectBulkItem(ProjectCreate):
+    """Project for bulk upsert/import; an existing id updates that project"""
+    id: Optional[int] = None
+    created_at: Optional[datetime] = None
+
+
+class ProjectBulkRequest(BaseModel):
+    """Schema for bulk create/upsert"""
+    projects: List[ProjectBulkItem]
+
+
+class ProjectBulkDeleteRequest(BaseModel):
+    """Schema for bulk delete"""
+    ids: List[int]
+
+
 class ProjectUpdate(BaseModel):
     """Schema for updating a project (all fields optional)"""
     title: Optional[str] = None
@@ -42,6 +74,7 @@ class ProjectUpdate(BaseModel):
 class ProjectResponse(ProjectBase):
     """Schema for project response"""
     id: int
+    media: Dict[str, ImageMeta] = Field(default_factory=dict, description="Image metadata by URL; missing for unprocessed images")
     created_at: datetime
     updated_at: datetime
     
@@ -49,12 +82,168 @@ class ProjectResponse(ProjectBase):
         from_attributes = True
 
 
+class ProjectSummaryResponse(BaseModel):
+    """Compact project representation for list views"""
+    id: int
+    title: str
+    title_en: Optional[str] = None
+    category: str
+    category_en: Optional[str] = None
+    status: str
+    status_en: Optional[str] = None
+    year: str
+    image: str
+    media: Dict[str, ImageMeta] = Field(default_factory=dict)
+
+
+class RelatedProjectsResponse(BaseModel):
+    """Neighbours of a project in the list and similar projects"""
+    id: int
+    previous: Optional[ProjectSummaryResponse] = Field(None, description="Newer project, shown before this one in the list")
+    next: Optional[ProjectSummaryResponse] = Field(None, description="Older project, shown after this one in the list")
+    related: List[ProjectSummaryResponse] = Field(default_factory=list, description="Most similar projects first")
+
+
+class LocalizedProjectResponse(BaseModel):
+    """Project in a single language (requested with lang)"""
+    id: int
+    title: str
+    category: str
+    status: str
+    year: str
+    image: str
+    description: str
+    client: Optional[str] = None
+    role: Optional[str] = None
+    images: List[str] = Field(default_factory=list)
+    media: Dict[str, ImageMeta] = Field(default_factory=dict)
+    created_at: datetime
+    updated_at: datetime
+
+
+class LocalizedProjectSummaryResponse(BaseModel):
+    """Compact project representation in a single language (view=summary with lang)"""
+    id: int
+    title: str
+    category: str
+    status: str
+    year: str
+    image: str
+    media: Dict[str, ImageMeta] = Field(default_factory=dict)
+
+
+class LocalizedRelatedProjectsResponse(BaseModel):
+    """Neighbours and similar projects in a single language (requested with lang)"""
+    id: int
+    previous: Optional[LocalizedProjectSummaryResponse] = None
+    next: Optional[LocalizedProjectSummaryResponse] = None
+    related: List[LocalizedProjectSummaryResponse] = Field(default_factory=list)
+
+
 class ProjectListResponse(BaseModel):
     """Schema for projects list response"""
     projects: List[ProjectResponse]
+    total: Optional[int] = Field(None, description="Number of matching projects, null when include_total=false")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, null on the last page")
+
+
+class LocalizedProjectListResponse(BaseModel):
+    """Schema for projects list response with lang"""
+    projects: List[LocalizedProjectResponse]
+    total: Optional[int] = None
+    next_cursor: Optional[str] = None
+    lang: str
+
+
+class ProjectSearchResponse(BaseModel):
+    """Schema for full-text search results, best match first"""
+    query: str
+    projects: List[ProjectResponse]
     total: int
+    limit: int
+    offset: int
+
+
+class ProjectSummaryListResponse(BaseModel):
+    """Schema for projects list response with view=summary"""
+    projects: List[ProjectSummaryResponse]
+    total: Optional[int] = None
+    next_cursor: Optional[str] = None
+
+
+class LocalizedProjectSummaryListResponse(BaseModel):
+    """Schema for projects list response with view=summary and lang"""
+    projects: List[LocalizedProjectSummaryResponse]
+    total: Optional[int] = None
+    next_cursor: Optional[str] = None
+    lang: str
     
     
 class MessageResponse(BaseModel):
     """Generic message response"""
     message: str
+
+
+class ProjectChangeResponse(BaseModel):
+    """One entry of the project change log"""
+    id: int
+    project_id: int
+    operation: str = Field(..., description="create, update or delete")
+    changes: Dict[str, List[Any]] = Field(default_factory=dict, description="Changed fields: [old value, new value]")
+    created_at: datetime
+
+
+class ChangeFeedResponse(BaseModel):
+    """Page of the change log, oldest first"""
+    changes: List[ProjectChangeResponse]
+    next_since: int = Field(..., description="Pass as since to get the following changes")
+    has_more: bool
+
+
+class BulkWriteResponse(BaseModel):
+    """Result of a batch write"""
+    created: int = 0
+    updated: int = 0
+    deleted: int = 0
+
+
+class ImportResponse(BulkWriteResponse):
+    """Result of an NDJSON import; on failure the batches before the failed line stay written"""
+    failed_line: Optional[int] = None
+    error: Optional[str] = None
+
+
+class PoolStatsResponse(BaseModel):
+    """Database connection pool statistics"""
+    backend: str
+    min_size: Optional[int] = None
+    max_size: Optional[int] = None
+    size: Optional[int] = None
+    idle: Optional[int] = None
+    in_use: Optional[int] = None
+    waiting: Optional[int] = None
+    acquire_timeouts: Optional[int] = None
+
+
+class ReadinessResponse(BaseModel):
+    """Readiness of this worker to serve requests"""
+    ready: bool
+    database: str
+    pending: List[str] = []  # startup steps still running in the background
+    failed: List[str] = []
+    startup: Dict[str, float] = {}  # step durations, seconds
+
+
+class CacheStatsResponse(BaseModel):
+    """Catalog cache counters"""
+    enabled: bool
+    size: int
+    max_size: int
+    ttl: float
+    hits: int
+    misses: int
+    hit_ratio: float
+    evictions: int
+    invalidations: int
+    coalesced: int  # requests that shared another request's load
+    in_flight: int
@@ -0,0 +1,195 @@
+"""
+Full-text search over project texts
+
+PostgreSQL uses a GIN index over Russian and English ``tsvector`` documents.
+Other databases (SQLite in development) use an in-process inverted index that
+is kept up to date by the write endpoints.
+"""
+import bisect
+import logging
+import math
+import re
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from app.database import uses_postgres
+from app.db_router import read_connection
+from app.models import Project
+
+logger = logging.getLogger(__name__)
+
+# Индексируемые поля и их вес при ранжировании
+SEARCH_FIELDS = {
+    "title": 3.0,
+    "title_en": 3.0,
+    "client": 2.0,
+    "role": 2.0,
+    "description": 1.0,
+    "description_en": 1.0,
+}
+
+# Документ для PostgreSQL; GIN-индекс idx_projects_search создается миграцией
+# migrations/models/2_*_hot_path_indexes.py, выражение там должно быть тем же
+SEARCH_DOCUMENT = (
+    "setweight(to_tsvector('russian', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(title_en, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(client, '') || ' ' || coalesce(role, '')), 'B') || "
+    "setweight(to_tsvector('russian', coalesce(description, '')), 'C') || "
+    "setweight(to_tsvector('english', coalesce(description_en, '')), 'C')"
+)
+
+SEARCH_QUERY = (
+    "plainto_tsquery('russian', $1) || "
+    "plainto_tsquery('english', $1) || "
+    "plainto_tsquery('simple', $1)"
+)
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Split text into lowercase word tokens"""
+    if not text:
+        return []
+    return _TOKEN_RE.findall(text.lower().replace("ё", "е"))
+
+
+class InvertedIndex:
+    """
+    In-process inverted index with prefix matching and TF-IDF ranking
+
+    Prefix matching stands in for stemming, so "дизайн" also finds
+    "дизайнера" and "brand" finds "branding".
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+        self._documents: Dict[int, List[str]] = {}
+        # Отсортированный словарь для поиска по префиксу; пересобирается лениво
+        self._vocabulary: Optional[List[str]] = None
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def clear(self) -> None:
+        self._postings.clear()
+        self._documents.clear()
+        self._vocabulary = None
+
+    def add(self, project_id: int, texts: Dict[str, Optional[str]]) -> None:
+        """Index a project, replacing its previous version"""
+        self.remove(project_id)
+        weights: Dict[str, float] = defaultdict(float)
+        for field, weight in SEARCH_FIELDS.items():
+            for token in tokenize(texts.get(field)):
+                weights[token] += weight
+        for token, weight in weights.items():
+            self._postings[token][project_id] = weight
+        self._documents[project_id] = list(weights)
+        self._vocabulary = None
+
+    def remove(self, project_id: int) -> None:
+        for token in self._documents.pop(project_id, []):
+            postings = self._postings.get(token)
+            if postings is None:
+                continue
+            postings.pop(project_id, None)
+            if not postings:
+                del self._postings[token]
+        self._vocabulary = None
+
+    def _tokens_with_prefix(self, prefix: str) -> List[str]:
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._postings)
+        start = bisect.bisect_left(self._vocabulary, prefix)
+        end = bisect.bisect_left(self._vocabulary, prefix + "\U0010ffff")
+        return self._vocabulary[start:end]
+
+    def search(self, query: str) -> List[Tuple[int, float]]:
+        """Return (project_id, rank) pairs ordered by rank; every query term must match"""
+        terms = tokenize(query)
+        if not terms:
+            return []
+
+        total_docs = len(self._documents) or 1
+        scores: Optional[Dict[int, float]] = None
+        for term in dict.fromkeys(terms):
+            term_scores: Dict[int, float] = defaultdict(float)
+            for token in self._tokens_with_prefix(term):
+                postings = self._postings[token]
+                idf = math.log(1 + total_docs / len(postings))
+                # Точное совпадение слова ценится выше совпадения по префиксу
+                boost = 1.0 if token == term else 0.5
+                for project_id, weight in postings.items():
+                    term_scores[project_id] += weight * idf * boost
+            if scores is None:
+                scores = dict(term_scores)
+            else:
+                scores = {pid: score + term_scores[pid] for pid, score in scores.items() if pid in term_scores}
+            if not scores:
+                return []
+
+        return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+
+
+search_index = InvertedIndex()
+
+
+async def init_search() -> None:
+    """Build the in-process index; PostgreSQL uses the GIN index from the migrations"""
+    if uses_postgres():
+        return
+
+    search_index.clear()
+    rows = await Project.all().values("id", *SEARCH_FIELDS)
+    for row in rows:
+        search_index.add(row["id"], row)
+    logger.info(f"In-process search index built for {len(search_index)} projects")
+
+
+def index_project(project: Project) -> None:
+    """Update the in-process index after a create/update"""
+    if uses_postgres():
+        return
+    search_index.add(project.id, {field: getattr(project, field) for field in SEARCH_FIELDS})
+
+
+async def reindex_projects() -> None:
+    """Rebuild the in-process index after a batch write"""
+    if uses_postgres():
+        return
+    await init_search()
+
+
+def unindex_project(project_id: int) -> None:
+    """Remove a deleted project from the in-process index"""
+    if uses_postgres():
+        return
+    search_index.remove(project_id)
+
+
+async def search_projects(query: str, limit: int, offset: int) -> Tuple[List[int], int]:
+    """Return ids of one page of matching projects, best match first, and the total"""
+    if uses_postgres():
+        conn = read_connection()
+        rows = await conn.execute_query_dict(
+            f"SELECT id, ts_rank({SEARCH_DOCUMENT}, q.query) AS rank, count(*) OVER () AS total "
+            f"FROM projects, (SELECT {SEARCH_QUERY} AS query) AS q "
+            f"WHERE ({SEARCH_DOCUMENT}) @@ q.query "
+            "ORDER BY rank DESC, id LIMIT $2 OFFSET $3",
+            [query, limit, offset],
+        )
+        if rows:
+            return [row["id"] for row in rows], rows[0]["total"]
+        if offset == 0:
+            return [], 0
+        # Страница за пределами результатов: total считаем отдельно
+        count = await conn.execute_query_dict(
+            f"SELECT count(*) AS total FROM projects, (SELECT {SEARCH_QUERY} AS query) AS q "
+            f"WHERE ({SEARCH_DOCUMENT}) @@ q.query",
+            [query],
+        )
+        return [], count[0]["total"]
+
+    matches = search_index.search(query)
+    return [project_id for project_id, _ in matches[offset:offset + limit]], len(matches)
@@ -4,7 +4,11 @@ Run with: uv run python -m app.seed_data
 """
 import asyncio
 from tortoise import Tortoise
+from tortoise.transactions import in_transaction
+from app.audit import AUDITED_FIELDS, audit_log, project_values
+from app.bulk import upsert_projects
 from app.config import settings
+from app.database import migrate_db
 from app.models import Project
 
 # Initial project data (from your original projects.ts file)
@@ -80,26 +84,35 @@ INITIAL_PROJECTS = [
 
 async def seed_database():
     """Seed the database with initial project data"""
+    print("Applying migrations...")
+    for version in await migrate_db():
+        print(f"  {version}")
+    
     print("Connecting to database...")
     await Tortoise.init(
         db_url=settings.DATABASE_URL,
         modules={"models": ["app.models"]}
     )
     
-    print("Generating schemas...")
-    await Tortoise.generate_schemas()
-    
     # Check if data already exists
     existing_count = await Project.all().count()
     if existing_count > 0:
         print(f"Database already contains {existing_count} projects.")
-        print("Clearing existing projects...")
-        await Project.all().delete()
+        print("Existing projects will be replaced.")
     
     print("Seeding database with initial projects...")
-    for project_data in INITIAL_PROJECTS:
-        project = await Project.create(**project_data)
-        print(f"[OK] Created: {project.title}")
+    # Замена каталога попадает в журнал изменений, как запись через API:
+    # потребители /api/changes видят удаление старых проектов и новые
+    await audit_log.start()
+    async with in_transaction():
+        removed = await Project.all().order_by("id").values("id", *AUDITED_FIELDS)
+        await Project.all().delete()
+        for row in removed:
+            audit_log.deleted(row["id"], project_values(row))
+        created, _, _ = await upsert_projects(INITIAL_PROJECTS)
+    # Очередь журнала пишется в фоне: дописываем ее до закрытия соединений
+    await audit_log.stop()
+    print(f"[OK] Created {created} projects in one batch")
     
     total = await Project.all().count()
     print(f"\n[SUCCESS] Successfully seeded {total} projects!")
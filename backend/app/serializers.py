@@ -0,0 +1,244 @@
+"""
+Conversion of projects into response dicts
+
+The dicts are built in the field order of the response schemas and contain
+only schema fields, so encoding them directly produces the same JSON as
+validating them through the schema first.
+"""
+from typing import Iterable, List, Optional, Tuple
+
+from tortoise.queryset import QuerySet
+
+from app.models import Project, CATEGORY_TRANSLATIONS, STATUS_TRANSLATIONS
+from app.schemas import ImageMeta, ImageVariant
+
+# Колонки таблицы projects в порядке ProjectResponse
+PROJECT_COLUMNS = (
+    "id",
+    "title",
+    "title_en",
+    "category",
+    "status",
+    "year",
+    "image",
+    "description",
+    "description_en",
+    "client",
+    "role",
+    "images",
+    "media",
+    "created_at",
+    "updated_at",
+)
+
+IMAGE_META_FIELDS = tuple(name for name in ImageMeta.model_fields if name != "variants")
+IMAGE_VARIANT_FIELDS = tuple(ImageVariant.model_fields)
+
+# Поля, которые вычисляются из колонок, а не хранятся в базе
+DERIVED_FIELDS = {
+    "category_en": "category",
+    "status_en": "status",
+}
+
+# Поля, которые нужны сетке проектов на главной странице
+SUMMARY_FIELDS = (
+    "id",
+    "title",
+    "title_en",
+    "category",
+    "category_en",
+    "status",
+    "status_en",
+    "year",
+    "image",
+    "media",
+)
+
+VIEWS = {
+    "summary": SUMMARY_FIELDS,
+}
+
+LANGUAGES = ("ru", "en")
+
+# Поля ответа при запросе с lang: один набор локализованных значений
+LOCALIZED_FIELDS = (
+    "id",
+    "title",
+    "category",
+    "status",
+    "year",
+    "image",
+    "description",
+    "client",
+    "role",
+    "images",
+    "media",
+    "created_at",
+    "updated_at",
+)
+
+LOCALIZED_VIEWS = {
+    "summary": ("id", "title", "category", "status", "year", "image", "media"),
+}
+
+# Текстовые колонки и их английские версии
+TRANSLATED_COLUMNS = {
+    "title": "title_en",
+    "description": "description_en",
+}
+
+
+def project_to_dict(row: dict) -> dict:
+    """Convert a ``.values(*PROJECT_COLUMNS)`` row to a response dict with English translations"""
+    # Ключи в порядке полей ProjectResponse
+    category, status = row["category"], row["status"]
+    return {
+        "title": row["title"],
+        "category": category,
+        "status": status,
+        "year": row["year"],
+        "image": row["image"],
+        "description": row["description"],
+        "client": row["client"],
+        "role": row["role"],
+        "images": row["images"],
+        "title_en": row["title_en"],
+        "description_en": row["description_en"],
+        "category_en": CATEGORY_TRANSLATIONS.get(category, category),
+        "status_en": STATUS_TRANSLATIONS.get(status, status),
+        "id": row["id"],
+        "media": media_to_dict(row["media"]),
+        "created_at": row["created_at"],
+        "updated_at": row["updated_at"],
+    }
+
+
+def project_row(project: Project) -> dict:
+    """Column values of a loaded project, as ``.values(*PROJECT_COLUMNS)`` returns them"""
+    return {name: getattr(project, name) for name in PROJECT_COLUMNS}
+
+
+def media_to_dict(media: Optional[dict]) -> dict:
+    """
+    Image metadata in the field order of ImageMeta
+
+    PostgreSQL stores JSON columns as jsonb, which does not keep key order.
+    """
+    if not media:
+        return {}
+    result = {}
+    for url, meta in media.items():
+        item = {name: meta[name] for name in IMAGE_META_FIELDS}
+        item["variants"] = [
+            {name: variant[name] for name in IMAGE_VARIANT_FIELDS}
+            for variant in meta.get("variants", ())
+        ]
+        result[url] = item
+    return result
+
+
+def check_lang(lang: Optional[str]) -> Optional[str]:
+    """Validate the ``lang`` query parameter; raises ValueError for unsupported languages"""
+    if lang is not None and lang not in LANGUAGES:
+        raise ValueError(f"Unsupported language: {lang}")
+    return lang
+
+
+def parse_fields(
+    fields: Optional[str],
+    view: Optional[str],
+    lang: Optional[str] = None,
+) -> Optional[Tuple[str, ...]]:
+    """
+    Resolve the ``fields``/``view`` query parameters into a tuple of response fields
+
+    Returns None when the full bilingual representation is requested. With
+    **lang** the fields refer to the localized representation. Raises
+    ValueError for unknown fields or views.
+    """
+    views = LOCALIZED_VIEWS if lang else VIEWS
+    if view is not None and view != "full":
+        if view not in views:
+            raise ValueError(f"Unknown view: {view}")
+        if not fields:
+            return views[view]
+    if not fields:
+        return LOCALIZED_FIELDS if lang else None
+
+    if lang:
+        allowed = set(LOCALIZED_FIELDS)
+    else:
+        allowed = set(PROJECT_COLUMNS) | set(DERIVED_FIELDS)
+    requested = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in requested if name not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+
+    # id нужен всегда, чтобы клиент мог открыть проект
+    ordered = ["id"] + [name for name in requested if name != "id"]
+    return tuple(dict.fromkeys(ordered))
+
+
+def columns_for(fields: Iterable[str], extra: Iterable[str] = ()) -> Tuple[str, ...]:
+    """Database columns needed to build the given response fields"""
+    columns = []
+    for name in list(fields) + list(extra):
+        columns.append(DERIVED_FIELDS.get(name, name))
+    return tuple(dict.fromkeys(columns))
+
+
+def row_to_dict(row: dict, fields: Iterable[str]) -> dict:
+    """Build a projected response dict from a ``.values()`` row"""
+    result = {}
+    for name in fields:
+        if name == "category_en":
+            result[name] = CATEGORY_TRANSLATIONS.get(row["category"], row["category"])
+        elif name == "status_en":
+            result[name] = STATUS_TRANSLATIONS.get(row["status"], row["status"])
+        elif name == "media":
+            result[name] = media_to_dict(row[name])
+        else:
+            result[name] = row[name]
+    return result
+
+
+def localized_values(query: QuerySet, lang: str, fields: Iterable[str]):
+    """
+    Select only the columns needed for one language
+
+    Russian skips the English text columns entirely; English also reads the
+    Russian ones as a fallback for missing translations.
+    """
+    columns = []
+    for name in fields:
+        if lang == "en" and name in TRANSLATED_COLUMNS:
+            columns.append(TRANSLATED_COLUMNS[name])
+        columns.append(name)
+    return query.values(*dict.fromkeys(columns))
+
+
+def localize_rows(rows: Iterable[dict], lang: str, fields: Iterable[str]) -> List[dict]:
+    """Build localized response dicts from ``localized_values`` rows"""
+    # Словари переводов выбираются один раз на запрос, а не для каждой строки
+    category_names = CATEGORY_TRANSLATIONS if lang == "en" else {}
+    status_names = STATUS_TRANSLATIONS if lang == "en" else {}
+    fields = tuple(fields)
+    translated = [
+        (name, TRANSLATED_COLUMNS[name])
+        for name in fields
+        if lang == "en" and name in TRANSLATED_COLUMNS
+    ]
+
+    result = []
+    for row in rows:
+        item = {name: row[name] for name in fields}
+        for name, column in translated:
+            item[name] = row[column] or item[name]
+        if "category" in item:
+            item["category"] = category_names.get(item["category"], item["category"])
+        if "status" in item:
+            item["status"] = status_names.get(item["status"], item["status"])
+        if "media" in item:
+            item["media"] = media_to_dict(item["media"])
+        result.append(item)
+    return result
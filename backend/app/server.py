@@ -0,0 +1,62 @@
+"""
+Production server: several uvicorn workers with uvloop and httptools
+
+    python -m app.server
+
+Pending database migrations are applied first, once for all workers
+(``DB_MIGRATE_ON_START``). The number of processes comes from ``WORKERS``
+(0 means one per CPU core).
+Each worker has its own connection pool and catalog cache; the caches are kept
+coherent through ``app.invalidation``.
+"""
+import asyncio
+import importlib.util
+import logging
+import os
+
+import uvicorn
+
+from app.config import settings
+from app.database import migrate_db
+
+logger = logging.getLogger(__name__)
+
+
+def worker_count() -> int:
+    """Number of worker processes to start"""
+    if settings.WORKERS > 0:
+        return settings.WORKERS
+    return os.cpu_count() or 1
+
+
+def _installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    if settings.DB_MIGRATE_ON_START:
+        # Воркеры схему не проверяют: она обновляется здесь, до их запуска
+        asyncio.run(migrate_db())
+    workers = worker_count()
+    # uvloop и httptools ставятся с uvicorn[standard]; на Windows uvloop нет
+    loop = "uvloop" if _installed("uvloop") else "asyncio"
+    http = "httptools" if _installed("httptools") else "h11"
+    logger.info(
+        f"Starting {workers} worker(s) on {settings.HOST}:{settings.PORT} "
+        f"(loop={loop}, http={http}, pool up to {workers * settings.DB_POOL_MAX_SIZE} connections)"
+    )
+    uvicorn.run(
+        "app.main:app",
+        host=settings.HOST,
+        port=settings.PORT,
+        workers=workers,
+        loop=loop,
+        http=http,
+        proxy_headers=True,
+        forwarded_allow_ips=settings.FORWARDED_ALLOW_IPS,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+"""
+Static snapshot of the read API for nginx
+
+    python -m app.snapshot [--output DIR]
+
+Writes the responses of ``GET /api/projects`` (every category, status, lang
+and view combination), ``GET /api/projects/{id}`` and ``GET /api/categories``
+as JSON files, each with pre-compressed ``.gz`` and ``.br`` copies. Responses
+are rendered by the application itself, so the files are byte-for-byte what
+the API would return.
+
+A file is named after the request: the URL path, then ``@`` and the query
+string if there is one, then ``.json``. For example
+``api/projects@category=Design&view=summary.json``. Query strings are encoded
+like the browser's ``URLSearchParams`` in the frontend API client.
+
+With ``SNAPSHOT_ROOT`` set, the running API also rewrites the affected files
+shortly after every write.
+"""
+import argparse
+import asyncio
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlencode
+
+from app.asgi import ASGIClient
+from app.compression import available_encodings, compress
+from app.config import settings
+from app.models import (
+    CATEGORY_TRANSLATIONS,
+    CATEGORY_TRANSLATIONS_REVERSE,
+    CategoryEnum,
+    Project,
+    StatusEnum,
+)
+
+try:
+    import fcntl
+except ImportError:  # Windows: блокировка сборки между воркерами не поддерживается
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_LANGS = (None, "ru", "en")
+SNAPSHOT_VIEWS = (None, "summary")
+SUFFIXES = {"gzip": ".gz", "br": ".br"}
+
+# Пауза перед обновлением: серия записей обрабатывается одним проходом
+REFRESH_DELAY = 0.5
+
+Request = Tuple[str, Dict[str, str]]
+
+
+def _params(**values: Optional[str]) -> Dict[str, str]:
+    # Порядок параметров как в frontend/api/client.ts
+    return {name: value for name, value in values.items() if value is not None}
+
+
+def list_requests() -> List[Request]:
+    """Every /api/projects request covered by the snapshot"""
+    categories = [None] + [c.value for c in CategoryEnum] + list(CATEGORY_TRANSLATIONS.values())
+    statuses = [None] + [s.value for s in StatusEnum]
+    return [
+        ("/api/projects", _params(category=category, status=status, lang=lang, view=view))
+        for category in categories
+        for status in statuses
+        for lang in SNAPSHOT_LANGS
+        for view in SNAPSHOT_VIEWS
+    ]
+
+
+def detail_requests(project_id: int) -> List[Request]:
+    return [(f"/api/projects/{project_id}", _params(lang=lang)) for lang in SNAPSHOT_LANGS]
+
+
+def categories_requests() -> List[Request]:
+    return [("/api/categories", _params(lang=lang)) for lang in SNAPSHOT_LANGS]
+
+
+def file_name(path: str, params: Dict[str, str]) -> str:
+    """Snapshot file for a request, relative to the snapshot root"""
+    query = urlencode(params)
+    return path.lstrip("/") + (f"@{query}" if query else "") + ".json"
+
+
+class SnapshotWriter:
+    """Render API responses into pre-compressed static files"""
+
+    def __init__(self, root: str, app=None):
+        self.root = Path(root)
+        self.app = app
+        self._pending_projects: Set[int] = set()
+        self._pending_categories: Set[str] = set()
+        self._pending_statuses: Set[str] = set()
+        self._pending_counts = False
+        self._pending_full = False
+        self._task: Optional[asyncio.Task] = None
+
+    async def build(self) -> Dict[str, int]:
+        """Render the whole snapshot and delete files of removed projects"""
+        requests = list_requests() + categories_requests()
+        for project_id in await Project.all().order_by("id").values_list("id", flat=True):
+            requests += detail_requests(project_id)
+
+        stats = await self._render(requests)
+        expected = {file_name(path, params) for path, params in requests}
+        api_dir = self.root / "api"
+        if api_dir.is_dir():
+            for path in api_dir.rglob("*.json"):
+                if path.relative_to(self.root).as_posix() not in expected:
+                    self._remove(path.relative_to(self.root).as_posix())
+                    stats["removed"] += 1
+        return stats
+
+    async def refresh_project(
+        self,
+        project_ids: Iterable[int],
+        categories: Iterable[str],
+        statuses: Iterable[str],
+        counts_changed: bool,
+    ) -> Dict[str, int]:
+        """Re-render the files a write to these projects could have changed"""
+        categories, statuses = set(categories), set(statuses)
+        requests = []
+        for path, params in list_requests():
+            category = params.get("category")
+            category = CATEGORY_TRANSLATIONS_REVERSE.get(category, category)
+            status = params.get("status")
+            if (category is None or category in categories) and (status is None or status in statuses):
+                requests.append((path, params))
+        if counts_changed:
+            requests += categories_requests()
+        for project_id in project_ids:
+            requests += detail_requests(project_id)
+        return await self._render(requests)
+
+    # Слушатель app.invalidation: вызывается после записей этого воркера
+
+    def project_changed(self, project_id: int, categories, statuses, counts_changed: bool) -> None:
+        self._pending_projects.add(project_id)
+        self._pending_categories.update(categories)
+        self._pending_statuses.update(statuses)
+        self._pending_counts = self._pending_counts or counts_changed
+        self._schedule()
+
+    def catalog_changed(self) -> None:
+        self._pending_full = True
+        self._schedule()
+
+    def _schedule(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._flush())
+
+    async def _flush(self) -> None:
+        await asyncio.sleep(REFRESH_DELAY)
+        while self._pending_full or self._pending_projects:
+            full, self._pending_full = self._pending_full, False
+            projects, self._pending_projects = self._pending_projects, set()
+            categories, self._pending_categories = self._pending_categories, set()
+            statuses, self._pending_statuses = self._pending_statuses, set()
+            counts, self._pending_counts = self._pending_counts, False
+            try:
+                if full:
+                    stats = await self.build()
+                else:
+                    stats = await self.refresh_project(projects, categories, statuses, counts)
+                logger.info(f"Snapshot updated: {stats}")
+            except Exception as e:
+                logger.error(f"Error updating snapshot: {e}")
+
+    async def _render(self, requests: List[Request]) -> Dict[str, int]:
+        # Внутренние запросы: лимит по IP не должен обрывать рендер снимка
+        client = ASGIClient(self.app, internal=True)
+        # Читаем с primary: реплика может еще не видеть только что записанное
+        headers = [("cookie", "read_primary=1")]
+        stats = {"written": 0, "unchanged": 0, "removed": 0}
+        for path, params in requests:
+            name = file_name(path, params)
+            status, body = await client.request("GET", path, params=params, headers=headers)
+            if status == 404:
+                if (self.root / name).exists():
+                    self._remove(name)
+                    stats["removed"] += 1
+                continue
+            if status != 200:
+                raise RuntimeError(f"GET {name} returned {status}")
+            if self._write(name, body):
+                stats["written"] += 1
+            else:
+                stats["unchanged"] += 1
+        return stats
+
+    def _write(self, name: str, body: bytes) -> bool:
+        target = self.root / name
+        # Неизменные файлы не трогаем: mtime и ETag в nginx остаются прежними
+        if target.exists() and target.read_bytes() == body:
+            return False
+        target.parent.mkdir(parents=True, exist_ok=True)
+        for encoding in available_encodings():
+            _write_atomic(target.with_name(target.name + SUFFIXES[encoding]), compress(body, encoding))
+        # Несжатый файл последним: по нему проверяется актуальность
+        _write_atomic(target, body)
+        return True
+
+    def _remove(self, name: str) -> None:
+        target = self.root / name
+        for suffix in ("", *SUFFIXES.values()):
+            target.with_name(target.name + suffix).unlink(missing_ok=True)
+
+
+def _write_atomic(target: Path, data: bytes) -> None:
+    tmp = target.with_name(f".{target.name}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, target)
+
+
+async def build_on_startup(writer: SnapshotWriter) -> None:
+    """Rebuild the snapshot in one worker; the others skip while it runs"""
+    writer.root.mkdir(parents=True, exist_ok=True)
+    lock = open(writer.root / ".build.lock", "w")
+    try:
+        if fcntl is not None:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return
+        stats = await writer.build()
+        logger.info(f"Snapshot built in {writer.root}: {stats}")
+    except Exception as e:
+        logger.error(f"Error building snapshot: {e}")
+    finally:
+        lock.close()
+
+
+async def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Write the read API to static files for nginx")
+    parser.add_argument("--output", default=settings.SNAPSHOT_ROOT or "snapshot", help="Snapshot directory")
+    args = parser.parse_args(argv)
+
+    from app.database import init_db, close_db
+    from app.main import app
+
+    logging.basicConfig(level=logging.INFO)
+    await init_db()
+    try:
+        stats = await SnapshotWriter(args.output, app).build()
+    finally:
+        await close_db()
+    print(f"Snapshot written to {args.output}: {stats}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
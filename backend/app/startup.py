@@ -0,0 +1,167 @@
+"""
+Startup timings and deferred initialization
+
+``startup_profile`` records how long the imports of ``app.main`` and every
+initialization step took; with ``STARTUP_PROFILE`` the summary is logged by
+each worker. ``warmup`` runs the steps that are not needed to answer the first
+request (search index, connection pool): with ``FAST_START`` they continue in
+the background after the worker starts accepting requests, otherwise startup
+waits for them.
+
+Profile the whole startup from the backend directory:
+
+    python -m app.startup
+
+Only the standard library is imported here, so that ``app.main`` can import
+this module first and time its own imports.
+"""
+import asyncio
+import logging
+import time
+from contextlib import contextmanager
+from typing import Awaitable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Группы импортов для python -m app.startup: каждая учитывается без уже
+# загруженных предыдущими модулей
+IMPORT_GROUPS = (
+    "pydantic",
+    "fastapi",
+    "tortoise",
+    "app.config",
+    "app.models",
+    "app.schemas",
+    "app.database",
+    "app.main",
+)
+
+
+class StartupProfile:
+    """Durations of the startup steps of this process, in order"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.steps: Dict[str, float] = {}
+        self.ready_after: Optional[float] = None
+
+    def mark(self, name: str) -> None:
+        """Record a step that started with the process"""
+        self.steps[name] = time.perf_counter() - self.started
+
+    @contextmanager
+    def step(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.steps[name] = time.perf_counter() - start
+
+    def ready(self) -> None:
+        """The worker accepts requests from now on"""
+        self.ready_after = time.perf_counter() - self.started
+
+    def report(self) -> dict:
+        return {
+            "steps": {name: round(duration, 4) for name, duration in self.steps.items()},
+            "ready_after": None if self.ready_after is None else round(self.ready_after, 4),
+        }
+
+    def summary(self) -> str:
+        steps = ", ".join(f"{name} {duration * 1000:.0f} ms" for name, duration in self.steps.items())
+        if self.ready_after is None:
+            return steps
+        return f"{steps}; ready after {self.ready_after * 1000:.0f} ms"
+
+
+class Warmup:
+    """Initialization steps that may finish after the worker starts serving"""
+
+    def __init__(self, profile: StartupProfile):
+        self.profile = profile
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def add(self, name: str, coro: Awaitable) -> None:
+        self._tasks[name] = asyncio.create_task(self._run(name, coro))
+
+    async def _run(self, name: str, coro: Awaitable) -> None:
+        with self.profile.step(name):
+            await coro
+
+    def pending(self) -> List[str]:
+        return [name for name, task in self._tasks.items() if not task.done()]
+
+    def failed(self) -> List[str]:
+        return [
+            name for name, task in self._tasks.items()
+            if task.done() and not task.cancelled() and task.exception() is not None
+        ]
+
+    async def wait(self, name: str) -> None:
+        """Wait for one step, if it is still running; its errors are not raised"""
+        task = self._tasks.get(name)
+        if task is not None and not task.done():
+            # shield: отмена запроса не должна отменять сам шаг
+            await asyncio.wait([asyncio.shield(task)])
+
+    async def wait_all(self) -> None:
+        """Wait for every step, raising the first error"""
+        for name, task in self._tasks.items():
+            try:
+                await task
+            except Exception as e:
+                logger.error(f"Startup step '{name}' failed: {e}")
+                raise
+
+    async def cancel(self) -> None:
+        for task in self._tasks.values():
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        self._tasks.clear()
+
+    async def finish(self, log_summary: bool) -> None:
+        """Wait for the background steps and log their outcome"""
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        for name in self.failed():
+            logger.error(f"Deferred startup step '{name}' failed: {self._tasks[name].exception()}")
+        if log_summary:
+            logger.info(f"Startup profile: {self.profile.summary()}")
+
+
+startup_profile = StartupProfile()
+warmup = Warmup(startup_profile)
+
+
+async def _profile_startup() -> None:
+    import importlib
+
+    started = time.perf_counter()
+    imports = {}
+    for module in IMPORT_GROUPS:
+        start = time.perf_counter()
+        importlib.import_module(module)
+        imports[module] = time.perf_counter() - start
+
+    # Запущенный через -m модуль - это __main__; приложение пишет в app.startup
+    from app.config import settings
+    from app.main import app
+    from app.startup import startup_profile, warmup
+
+    logging.getLogger().setLevel(logging.WARNING)
+    async with app.router.lifespan_context(app):
+        serving = time.perf_counter() - started
+        await warmup.wait_all()
+        warm = time.perf_counter() - started
+
+    print("imports")
+    for module, duration in imports.items():
+        print(f"  {module:<24} {duration * 1000:>8.1f} ms")
+    print(f"startup steps (FAST_START={settings.FAST_START})")
+    for name, duration in startup_profile.steps.items():
+        if name != "imports":
+            print(f"  {name:<24} {duration * 1000:>8.1f} ms")
+    print(f"accepting requests after {serving * 1000:.1f} ms, fully warm after {warm * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(_profile_startup())
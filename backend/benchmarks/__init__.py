@@ -0,0 +1,3 @@
+"""
+Offline load tests and micro-benchmarks for the backend API
+"""
@@ -0,0 +1,229 @@
+"""
+Load test of the API, driven in-process through ASGI
+
+Seeds a synthetic catalog, then runs each scenario with concurrent clients and
+reports throughput and latency percentiles. Run from the backend directory:
+
+    python -m benchmarks.api --projects 10000 --concurrency 16 --requests 2000 --output results.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+SCENARIOS = ("list", "list_filtered", "list_summary", "detail", "categories", "write")
+
+Request = Tuple[str, str, Optional[dict], bytes]
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="In-process API load test")
+    parser.add_argument("--projects", type=int, default=10_000, help="Synthetic catalog size")
+    parser.add_argument("--requests", type=int, default=2_000, help="Measured requests per scenario")
+    parser.add_argument("--warmup", type=int, default=50, help="Unmeasured requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent clients")
+    parser.add_argument("--page-size", type=int, default=24, help="limit for list scenarios")
+    parser.add_argument(
+        "--scenarios", default=",".join(SCENARIOS),
+        help=f"Comma-separated subset of: {', '.join(SCENARIOS)}",
+    )
+    parser.add_argument("--db-url", default=None, help="Database URL (default: temporary SQLite file)")
+    parser.add_argument("--skip-seed", action="store_true", help="Use the existing data in --db-url")
+    parser.add_argument(
+        "--reset", action="store_true", help="Allow replacing all projects in --db-url with the synthetic catalog",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Disable the catalog cache")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for data and request mix")
+    parser.add_argument("--output", default=None, help="Write results as JSON to this file")
+    return parser.parse_args(argv)
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of already sorted values"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(q / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float, concurrency: int) -> dict:
+    values = sorted(latencies)
+    to_ms = 1000.0
+    return {
+        "requests": len(values),
+        "concurrency": concurrency,
+        "errors": errors,
+        "elapsed_s": round(elapsed, 4),
+        "throughput_rps": round(len(values) / elapsed, 1) if elapsed else 0.0,
+        "latency_ms": {
+            "mean": round(sum(values) / len(values) * to_ms, 3) if values else 0.0,
+            "p50": round(percentile(values, 50) * to_ms, 3),
+            "p95": round(percentile(values, 95) * to_ms, 3),
+            "p99": round(percentile(values, 99) * to_ms, 3),
+            "max": round(values[-1] * to_ms, 3) if values else 0.0,
+        },
+    }
+
+
+def request_factory(name: str, ids: List[int], page_size: int) -> Callable[[random.Random], Request]:
+    """Build a generator of (method, path, params, body) for a scenario"""
+    from app.models import CATEGORY_TRANSLATIONS
+
+    categories = list(CATEGORY_TRANSLATIONS) + list(CATEGORY_TRANSLATIONS.values())
+
+    if name == "list":
+        return lambda rng: ("GET", "/api/projects", {"limit": page_size}, b"")
+    if name == "list_filtered":
+        return lambda rng: (
+            "GET", "/api/projects", {"limit": page_size, "category": rng.choice(categories)}, b"",
+        )
+    if name == "list_summary":
+        return lambda rng: ("GET", "/api/projects", {"limit": page_size, "view": "summary"}, b"")
+    if name == "detail":
+        return lambda rng: ("GET", f"/api/projects/{rng.choice(ids)}", None, b"")
+    if name == "categories":
+        return lambda rng: ("GET", "/api/categories", {"lang": rng.choice(("ru", "en"))}, b"")
+    if name == "write":
+        return lambda rng: (
+            "PATCH", f"/api/projects/{rng.choice(ids)}", None,
+            json.dumps({"title_en": f"Benchmark {rng.random():.6f}"}).encode(),
+        )
+    raise ValueError(f"Unknown scenario: {name}")
+
+
+async def run_scenario(client, make_request, total: int, concurrency: int, rng: random.Random) -> dict:
+    latencies: List[float] = []
+    errors = 0
+    issued = 0
+
+    async def worker():
+        nonlocal issued, errors
+        while issued < total:
+            issued += 1
+            method, path, params, body = make_request(rng)
+            headers = [("content-type", "application/json")] if body else []
+            start = time.perf_counter()
+            status, _ = await client.request(method, path, params=params, body=body, headers=headers)
+            latencies.append(time.perf_counter() - start)
+            if status >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - started, concurrency)
+
+
+async def seed_catalog(count: int, seed: int) -> float:
+    """Replace the catalog with ``count`` synthetic projects; returns seconds spent"""
+    from app.bulk import upsert_projects
+    from app.models import Project
+    from benchmarks.catalog import generate_projects
+
+    started = time.perf_counter()
+    await Project.all().delete()
+    batch = []
+    for item in generate_projects(count, seed=seed):
+        batch.append(item)
+        if len(batch) == 1000:
+            await upsert_projects(batch)
+            batch = []
+    if batch:
+        await upsert_projects(batch)
+    return time.perf_counter() - started
+
+
+async def run(args: argparse.Namespace) -> dict:
+    from app.asgi import ASGIClient
+    from app.cache import catalog_cache
+    from app.database import migrate_db
+    from app.main import app
+    from app.models import Project
+    from app.search import init_search
+
+    logging.getLogger().setLevel(logging.WARNING)
+    scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    rng = random.Random(args.seed)
+    client = ASGIClient(app)
+    results: Dict[str, dict] = {}
+
+    await migrate_db()
+    async with app.router.lifespan_context(app):
+        seed_seconds = None
+        if not args.skip_seed:
+            seed_seconds = round(await seed_catalog(args.projects, args.seed), 3)
+            catalog_cache.clear()
+            await init_search()
+        ids = await Project.all().values_list("id", flat=True)
+        if not ids:
+            raise SystemExit("The catalog is empty; run without --skip-seed")
+
+        for name in scenarios:
+            make_request = request_factory(name, ids, args.page_size)
+            if args.warmup:
+                await run_scenario(client, make_request, args.warmup, args.concurrency, rng)
+            results[name] = await run_scenario(client, make_request, args.requests, args.concurrency, rng)
+            print_row(name, results[name])
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": os.environ["DATABASE_URL"].split("@")[-1],
+            "projects": len(ids),
+            "seed_seconds": seed_seconds,
+            "cache_enabled": not args.no_cache,
+            "args": {key: value for key, value in vars(args).items() if key != "db_url"},
+        },
+        "scenarios": results,
+    }
+
+
+def print_row(name: str, result: dict) -> None:
+    latency = result["latency_ms"]
+    print(
+        f"{name:<14} {result['throughput_rps']:>9.1f} rps  "
+        f"p50 {latency['p50']:>8.2f} ms  p95 {latency['p95']:>8.2f} ms  "
+        f"p99 {latency['p99']:>8.2f} ms  errors {result['errors']}"
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    if args.db_url is not None and not args.skip_seed and not args.reset:
+        # Заполнение удаляет все проекты: чужую базу без явного согласия не трогаем
+        raise SystemExit("Seeding deletes every project in --db-url; pass --reset or --skip-seed")
+
+    # Настройки читаются при импорте app.config, поэтому окружение задаем заранее
+    tmpdir = None
+    if args.db_url is None:
+        tmpdir = tempfile.TemporaryDirectory(prefix="portfolio-bench-")
+        args.db_url = f"sqlite://{tmpdir.name}/bench.db"
+    os.environ["DATABASE_URL"] = args.db_url
+    # Синтетические записи и удаления не должны попадать в журнал изменений
+    os.environ["AUDIT_ENABLED"] = "false"
+    if args.no_cache:
+        os.environ["CACHE_ENABLED"] = "false"
+
+    try:
+        report = asyncio.run(run(args))
+    finally:
+        if tmpdir is not None:
+            tmpdir.cleanup()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"Results written to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
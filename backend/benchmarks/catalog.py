@@ -0,0 +1,48 @@
+"""
+Synthetic project catalog for benchmarks
+"""
+import random
+from typing import Iterator, List
+
+from app.models import CategoryEnum, StatusEnum
+
+_RU_WORDS = (
+    "платформа", "приложение", "дизайн", "интерфейс", "аналитика", "клиент", "разработка",
+    "бренд", "сервис", "пользователь", "данные", "проект", "стартап", "команда", "продукт",
+    "исследование", "прототип", "инфраструктура", "мобильный", "веб", "система", "панель",
+)
+_EN_WORDS = (
+    "platform", "application", "design", "interface", "analytics", "client", "development",
+    "brand", "service", "user", "data", "project", "startup", "team", "product",
+    "research", "prototype", "infrastructure", "mobile", "web", "system", "dashboard",
+)
+_ROLES = ("Frontend Lead", "Full Stack Dev", "Art Direction", "UI/UX", "3D Artist", "Backend Dev")
+
+
+def _sentence(rng: random.Random, words, length: int) -> str:
+    return " ".join(rng.choice(words) for _ in range(length)).capitalize() + "."
+
+
+def _image(rng: random.Random, width: int) -> str:
+    return f"https://images.unsplash.com/photo-{rng.randrange(10**12, 10**13)}?q=80&w={width}&auto=format&fit=crop"
+
+
+def generate_projects(count: int, seed: int = 42) -> Iterator[dict]:
+    """Yield ``count`` reproducible projects with RU/EN text and image arrays"""
+    rng = random.Random(seed)
+    categories: List[CategoryEnum] = list(CategoryEnum)
+    statuses: List[StatusEnum] = list(StatusEnum)
+    for index in range(count):
+        yield {
+            "title": f"{_sentence(rng, _RU_WORDS, 2)[:-1]} {index}",
+            "title_en": f"{_sentence(rng, _EN_WORDS, 2)[:-1]} {index}",
+            "category": rng.choice(categories).value,
+            "status": rng.choice(statuses).value,
+            "year": str(rng.randint(2015, 2025)),
+            "image": _image(rng, 2670),
+            "description": " ".join(_sentence(rng, _RU_WORDS, rng.randint(8, 16)) for _ in range(3)),
+            "description_en": " ".join(_sentence(rng, _EN_WORDS, rng.randint(8, 16)) for _ in range(3)),
+            "client": f"Client {rng.randint(1, max(count // 10, 1))}",
+            "role": rng.choice(_ROLES),
+            "images": [_image(rng, 1470) for _ in range(rng.randint(1, 5))],
+        }
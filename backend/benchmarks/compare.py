@@ -0,0 +1,45 @@
+"""
+Compare two benchmark result files
+
+    python -m benchmarks.compare baseline.json candidate.json
+"""
+import json
+import sys
+from typing import List, Optional
+
+
+def _change(old: float, new: float) -> str:
+    if not old:
+        return "   n/a"
+    return f"{(new - old) / old * 100:+6.1f}%"
+
+
+def compare(baseline: dict, candidate: dict) -> List[str]:
+    lines = [
+        f"{'scenario':<14} {'rps':>21} {'p50 ms':>21} {'p95 ms':>21} {'p99 ms':>21}",
+    ]
+    for name, old in baseline["scenarios"].items():
+        new = candidate["scenarios"].get(name)
+        if new is None:
+            continue
+        cells = [f"{new['throughput_rps']:>8.1f} {_change(old['throughput_rps'], new['throughput_rps'])}"]
+        for key in ("p50", "p95", "p99"):
+            before, after = old["latency_ms"][key], new["latency_ms"][key]
+            cells.append(f"{after:>8.2f} {_change(before, after)}")
+        lines.append(f"{name:<14} " + " ".join(f"{cell:>21}" for cell in cells))
+    return lines
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 2:
+        raise SystemExit("usage: python -m benchmarks.compare BASELINE.json CANDIDATE.json")
+    with open(argv[0], encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(argv[1], encoding="utf-8") as f:
+        candidate = json.load(f)
+    print("\n".join(compare(baseline, candidate)))
+
+
+if __name__ == "__main__":
+    main()
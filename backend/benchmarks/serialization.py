@@ -0,0 +1,175 @@
+"""
+Per-row cost of building a project list response
+
+Compares two ways of turning a page of projects into a JSON body:
+
+- ``orm_validate``: load ``Project`` objects, convert them to dicts and
+  validate/dump them through ``ProjectListResponse``;
+- ``values_encode``: load ``.values()`` rows, build dicts with
+  ``project_to_dict`` and encode them with orjson (what the API does).
+
+Fetching and serialization are timed separately. Run from the backend directory:
+
+    python -m benchmarks.serialization --projects 2000 --page-size 100 --repeat 50
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+METHODS = ("orm_validate", "values_encode")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Per-row serialization cost of project lists")
+    parser.add_argument("--projects", type=int, default=2_000, help="Synthetic catalog size")
+    parser.add_argument("--page-size", type=int, default=100, help="Rows per response")
+    parser.add_argument("--repeat", type=int, default=50, help="Measured pages per method")
+    parser.add_argument("--db-url", default=None, help="Database URL (default: temporary SQLite file)")
+    parser.add_argument("--skip-seed", action="store_true", help="Use the existing data in --db-url")
+    parser.add_argument(
+        "--reset", action="store_true", help="Allow replacing all projects in --db-url with the synthetic catalog",
+    )
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the catalog")
+    parser.add_argument("--output", default=None, help="Write results as JSON to this file")
+    return parser.parse_args(argv)
+
+
+def build_methods(page_size: int) -> Dict[str, tuple]:
+    """(fetch, serialize) coroutine/function pairs for every method"""
+    from app.models import Project
+    from app.pagination import ORDERING
+    from app.responses import encode_json
+    from app.schemas import ProjectListResponse
+    from app.serializers import PROJECT_COLUMNS, project_row, project_to_dict
+
+    def page():
+        return Project.all().order_by(*ORDERING).limit(page_size)
+
+    async def fetch_objects():
+        return await page()
+
+    def serialize_objects(projects) -> bytes:
+        data = {
+            "projects": [project_to_dict(project_row(project)) for project in projects],
+            "total": None,
+            "next_cursor": None,
+        }
+        return ProjectListResponse.model_validate(data).model_dump_json().encode()
+
+    async def fetch_values():
+        return await page().values(*PROJECT_COLUMNS)
+
+    def serialize_values(rows) -> bytes:
+        data = {"projects": [project_to_dict(row) for row in rows], "total": None, "next_cursor": None}
+        return encode_json(data)
+
+    return {
+        "orm_validate": (fetch_objects, serialize_objects),
+        "values_encode": (fetch_values, serialize_values),
+    }
+
+
+async def measure(fetch: Callable, serialize: Callable, repeat: int) -> dict:
+    fetch_time = serialize_time = 0.0
+    rows = 0
+    body = b""
+    for _ in range(repeat):
+        started = time.perf_counter()
+        items = await fetch()
+        fetched = time.perf_counter()
+        body = serialize(items)
+        fetch_time += fetched - started
+        serialize_time += time.perf_counter() - fetched
+        rows += len(items)
+    to_us = 1_000_000 / max(rows, 1)
+    return {
+        "rows": rows,
+        "fetch_us_per_row": round(fetch_time * to_us, 3),
+        "serialize_us_per_row": round(serialize_time * to_us, 3),
+        "total_us_per_row": round((fetch_time + serialize_time) * to_us, 3),
+        "body": body,
+    }
+
+
+async def run(args: argparse.Namespace) -> dict:
+    from app.database import init_db, close_db, migrate_db
+    from benchmarks.api import seed_catalog
+
+    logging.getLogger().setLevel(logging.WARNING)
+    await migrate_db()
+    await init_db()
+    try:
+        if not args.skip_seed:
+            await seed_catalog(args.projects, args.seed)
+        methods = build_methods(args.page_size)
+        results = {}
+        for name in METHODS:
+            fetch, serialize = methods[name]
+            await measure(fetch, serialize, 2)  # прогрев
+            results[name] = await measure(fetch, serialize, args.repeat)
+            print_row(name, results[name])
+    finally:
+        await close_db()
+
+    # Оба способа должны давать одно и то же тело ответа
+    bodies = {result.pop("body") for result in results.values()}
+    identical = len(bodies) == 1
+    print(f"identical bodies: {identical}")
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": os.environ["DATABASE_URL"].split("@")[-1],
+            "args": {key: value for key, value in vars(args).items() if key != "db_url"},
+        },
+        "identical": identical,
+        "methods": results,
+    }
+
+
+def print_row(name: str, result: dict) -> None:
+    print(
+        f"{name:<14} fetch {result['fetch_us_per_row']:>8.2f} us/row  "
+        f"serialize {result['serialize_us_per_row']:>8.2f} us/row  "
+        f"total {result['total_us_per_row']:>8.2f} us/row"
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    if args.db_url is not None and not args.skip_seed and not args.reset:
+        # Заполнение удаляет все проекты: чужую базу без явного согласия не трогаем
+        raise SystemExit("Seeding deletes every project in --db-url; pass --reset or --skip-seed")
+
+    # Настройки читаются при импорте app.config, поэтому окружение задаем заранее
+    tmpdir = None
+    if args.db_url is None:
+        tmpdir = tempfile.TemporaryDirectory(prefix="portfolio-bench-")
+        args.db_url = f"sqlite://{tmpdir.name}/bench.db"
+    os.environ["DATABASE_URL"] = args.db_url
+    # Синтетические записи и удаления не должны попадать в журнал изменений
+    os.environ["AUDIT_ENABLED"] = "false"
+
+    try:
+        report = asyncio.run(run(args))
+    finally:
+        if tmpdir is not None:
+            tmpdir.cleanup()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"Results written to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Indexes for filtered, keyset-paginated project lists and full-text search
+"""
+from tortoise import BaseDBAsyncClient
+
+RUN_IN_TRANSACTION = True
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        -- Список проектов: ORDER BY created_at DESC, id (app.pagination.ORDERING),
+        -- курсор сравнивает ту же пару (created_at, id)
+        CREATE INDEX IF NOT EXISTS "idx_projects_created" ON "projects" ("created_at" DESC, "id");
+        CREATE INDEX IF NOT EXISTS "idx_projects_category_created" ON "projects" ("category", "created_at" DESC, "id");
+        CREATE INDEX IF NOT EXISTS "idx_projects_status_created" ON "projects" ("status", "created_at" DESC, "id");
+        -- Полнотекстовый поиск; выражение совпадает с app.search.SEARCH_DOCUMENT
+        CREATE INDEX IF NOT EXISTS "idx_projects_search" ON "projects" USING GIN ((
+            setweight(to_tsvector('russian', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(title_en, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(client, '') || ' ' || coalesce(role, '')), 'B') ||
+            setweight(to_tsvector('russian', coalesce(description, '')), 'C') ||
+            setweight(to_tsvector('english', coalesce(description_en, '')), 'C')
+        ));"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP INDEX IF EXISTS "idx_projects_search";
+        DROP INDEX IF EXISTS "idx_projects_status_created";
+        DROP INDEX IF EXISTS "idx_projects_category_created";
+        DROP INDEX IF EXISTS "idx_projects_created";"""
+
+
+MODELS_STATE = (
+    "eJztmG1v2joUgP9KlE+d1FvxurJpuhK35LZMhSDIdqetU2QSA14TO3OcrWjqf5/tOMQJgU"
+    "HVteOKLxGctxw/x3aO/cMMiQ+D+GxEyRfoMfO18cPEIIT8R1l1apgginKFEDAwDaRtlBpJ"
+    "IZjGjAIZbAaCGHKRD2OPooghgoW1CmnIQAaFEYUxxAzhuRERymYkQMTQQ/rE4zG5/kHeCU"
+    "ZfE+gyModsASmP8ekzFyPswzsYZ3+jW3eGYOAXGCBfBJByly0jKetj9q80FIlNXY8ESYhz"
+    "42jJFgSvrBGW6OYQQwoYFOEZTQQUnASB4pdxSjPNTdIUNR8fzkASCLTCe41sJtRwKZFHsK"
+    "gKzyaWA5yLt/zVqLfOW53my1aHm8hMVpLz+3R4+dhTR0lg6Jj3Ug8YSC0kxpwbQ4yHW0N3"
+    "sQC0mt3KoYSPJ13Gl8Haxi8T5ADzqfhIBENw5wYQz9lCYGu3t/B63x1fXHXHJ9zqhRgN4c"
+    "sjXTdDpWqkOgE1h+jxAc8JXVZztHASSpZ9nhfAHlxjqvs/M1azZ036l8PXxk1Sa9Vb4tns"
+    "yOe5fNbk85V8+je4Z723ru3RwBo6qUujpplJl5YuqcsnlPKG/A2UFk+c7th5N5qoOHXNpp"
+    "bH0SXNmZRMb7DtXFljPWdl3JRmzfylzXZ5l9pl0tRrO8yZem3jlBGq4ozhE4El8UPnS+79"
+    "dLPFlHD1SZBWoq3h7uSSZrpzFOdWf+iOxvbl2JqoKtcbxg5TpH2DL+zB6NpyrJ7y2zePPQ"
+    "ve2aHenY3l7pSrvYSA7rPHZvaHucU+/mpBIZhXfKQceLfpA585HArBLcQc64Mjkg7j+Gug"
+    "kzoZdD9IiOFSaa7t4WVmrpG9uLb/KRHV09yDa8ntSLearhcgmHaTu6743ONBTFXT+f/qqi"
+    "jZrzPN7I8EC/tmRZfxdmIPt2ycVZ3FO8yH98lHHjs1AhSzz7+tz3gzS7AnYBrTBAX8tBif"
+    "iRf+vd5PPMb6Fyi2r//yUhdsSMzmVEaRAcrrP4Q+AvtgXzn8SdTFaw+JujyZurDig/aL06"
+    "zyOe4bFd1BJc+dGoTDovrkLQKFYvguqGgTelzDUAg3tAoFzxJeX7meZT/+zIbM5GPwbRws"
+    "Va230e8PrInTHYwKJeh1HUtoGgX8mfTkZWm2r4IY//WdK0P8NT7aQ6u8razsnI+myAkkjL"
+    "iYfHeBr93tZdIMTKGwSeQ/sLBFz2Nhn7WwMnlx2zy71e5NhWAKvNvvgPrumoY0yCbbdVXY"
+    "CMsSgHnz5Su2Ikt1sd+FFHkLs+LKX2lOt934g9zmV/f9m8t8vJl/8pv5b5DGlcfzzd2M5n"
+    "IoR/Mn6GbE0tgDojI/TID12m6Xb9tu39au3/gbWeV9xuYDjebyXEea39YPPtrh5Vk/L/c/"
+    "AYX4nnI="
+)
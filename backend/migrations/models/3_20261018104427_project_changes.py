@@ -0,0 +1,52 @@
+"""
+Append-only log of project writes for GET /api/changes (app.audit)
+"""
+from tortoise import BaseDBAsyncClient
+
+RUN_IN_TRANSACTION = True
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "project_changes" (
+    "id" BIGSERIAL NOT NULL PRIMARY KEY,
+    "project_id" INT NOT NULL,
+    "operation" VARCHAR(10) NOT NULL,
+    "changes" JSONB NOT NULL,
+    "created_at" TIMESTAMPTZ NOT NULL
+);
+COMMENT ON COLUMN "project_changes"."operation" IS 'CREATE: create\nUPDATE: update\nDELETE: delete';
+COMMENT ON TABLE "project_changes" IS 'Append-only log of project writes, filled by app.audit';"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "project_changes";"""
+
+
+MODELS_STATE = (
+    "eJztmltv4jgUgP+KxVNX6lQQoDDVaiUK2ZZVuQjS2dEMo8gkhnqb2JnE2RaN+t/XdhJyId"
+    "CAmBZmeYnCucX+ju2c2Pwo2dRElncxdOk/yGClK/CjRKCN+E1WdQ5K0HFihRAwOLWkrRMY"
+    "SSGcesyFMtgMWh7iIhN5hosdhikR1mFIIAMBFzku8hBhmMyBQ102oxamIBnSpAaPyfU7ef"
+    "sEf/eRzugcsQfk8hhfv3ExJiZ6Rl7003nUZxhZZooBNkUAKdfZwpGyLmF/SkPRsKluUMu3"
+    "SWzsLNgDJUtrTCS6OSLIhQyJ8Mz1BRTiW1bIL+IUtDQ2CZqY8DHRDPqWQCu8V8hGwgSuUG"
+    "RQIrLCW+PJDs7FUz4olVqj1qxe1prcRLZkKWm8BN2L+x44SgJ9rfQi9ZDBwEJijLkxzHi4"
+    "FXTtB+jms1s6ZPDxRmfxRbA28YsEMcB4KO6JoA2fdQuROXsQ2Or1Dbw+tUbt29bojFv9Jn"
+    "pD+fQI5k0/VCmBTkCNIRq8w3PqLvI5qsS3JcsubxckBlphmvR/Z6yljjru3vSvwMQv1yo1"
+    "ca025bUhr2V5/Siv5oR01E/q3WDYU/ta4KKUE2bSpZaUVOQVSbki72GoJWOtNdLuh+MwTi"
+    "VhU47jJCXVmZRMJ2Sg3aqjZJtD46o0q8YPrdazq1SRQVMpFxgzlfLaISNU6RHDBwLzvV3H"
+    "S+z9dqOlJOEmB0GQiXoCdzOWVIOVIz22un19OBrcjNRxmOWKAgoMkfqEtAe94Z2qqZ3Qb9"
+    "t2bJnwZoF8N9emu5nN9gJBd5s1NrI/ziV2/7MF23Ce85LS0PO6F3zkcCwENxDT1M+aaLTt"
+    "ed+tJKmzXuuzhGgvQs3doH8TmSfItu8G1xmiyWZuwTXjdqKbT9ewMAqqyaIzPvbYiWlYdP"
+    "5aVZVLt6tMI/sTwdS6mVNl/DUe9DcsnHmVxT3h3ftqYoOdAwt77NtPqzN+n/nEEDDB1McW"
+    "/1r0LsQD/1itJ/Yx/wWKzfM/O9UFG+qxuSujyADZ+W8jE8NtsC8dDom6eOwxUZdfpjrKea"
+    "G98jUb+pzWjZzqIJdnoQLhuKi+eYngItF9HeaUCR2uYdhGa0qFlGcGrxm6XkQ3h1mQlXgf"
+    "zAGxFmGuN9Hv9tSx1uoNUynotDRVaJQU/kh6dpkZ7csg4O+udgvET/Bl0Fezy8rSTvtSEm"
+    "2CPqM6oU86NBN7e5E0ApNKrO+YOyY27XlK7LsmVjZe7DbPHhP7pkIwhcbjE3RNfUVDFbrO"
+    "dlVlK3ZWAgkvvsyQrWhlemOfv8WI3A1et/MfGpwX2P/XDWlb8Big5TiImB8ozyuw6BzQWb"
+    "RtD55czJB3DmbYspAJpgvAn30BfROzlfOA3cPs+WDgGs9/obOBj4pSrTaUcvWyWa81GvVm"
+    "eXlIsKradFpw3b0RBwapCfb6CUI0orY6gUk7vU77QFa3vRzGxOioIzqYuwdTbCM4FeC9Tw"
+    "7aI5Uv01cgKFAm5H7Ykb+D95o4KxA7uFeAr0mIocPYh08sg0W/1RIup6+13b/W/t8F8JHU"
+    "RVG3VyreA6mMWsjFxkNeSRRqNtZCMLZ5rQRan9jTfxbe/D8L/yLXW/vSzKeXcDmWQ4s32O"
+    "cRU2MLiKH5cQKslIsVD5uqh9XygRKWe9KzoXyIXd6rfPhpr669FQrv+np5+Q8MsoiT"
+)
@@ -0,0 +1,34 @@
+"""
+Shared fixtures: the app on a fresh in-memory SQLite database per test
+"""
+import os
+
+# Настройки читаются при импорте app.config, поэтому окружение задаем до импорта приложения
+os.environ["DATABASE_URL"] = "sqlite://:memory:"
+os.environ["DATABASE_READ_URL"] = ""
+os.environ["SNAPSHOT_ROOT"] = ""
+os.environ["IMAGE_PROCESSING_ENABLED"] = "false"
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.cache import catalog_cache
+from app.main import app
+from app.seed_data import INITIAL_PROJECTS
+
+
+@pytest.fixture
+def client():
+    # Кэш живет в модуле, а база у каждого теста своя
+    catalog_cache.clear()
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def seeded_client(client):
+    for project in INITIAL_PROJECTS:
+        response = client.post("/api/projects", json=project)
+        assert response.status_code == 201, response.text
+    return client
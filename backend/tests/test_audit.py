@@ -0,0 +1,127 @@
+import asyncio
+import os
+
+import aiosqlite
+import asyncpg
+import pytest
+from tortoise import Tortoise
+
+from app.audit import AuditLog, audit_log
+from app.config import settings
+from app.database import close_db, init_db
+from app.main import get_changes
+from app.models import ChangeOperation, ProjectChange
+
+# Гонка коммитов воспроизводится только на PostgreSQL (в SQLite один писатель)
+POSTGRES_URL = os.environ.get("TEST_POSTGRES_URL")
+
+
+def test_stop_waits_for_batch_in_flight(monkeypatch):
+    monkeypatch.setattr(settings, "AUDIT_ENABLED", True)
+    entered, release = asyncio.Event(), asyncio.Event()
+    executemany = aiosqlite.Connection.executemany
+
+    async def held_executemany(self, *args, **kwargs):
+        # Вставка пакета останавливается внутри уже открытой транзакции
+        entered.set()
+        await release.wait()
+        return await executemany(self, *args, **kwargs)
+
+    monkeypatch.setattr(aiosqlite.Connection, "executemany", held_executemany)
+
+    async def scenario():
+        await init_db()
+        try:
+            log = AuditLog(batch_size=500, flush_interval=60)
+            await log.start()
+            for project_id in range(600):
+                log.record(project_id, ChangeOperation.CREATE, {"title": [None, "x"]})
+            await entered.wait()
+            stopping = asyncio.create_task(log.stop())
+            await asyncio.sleep(0.05)
+            release.set()
+            await stopping
+            return await ProjectChange.all().count(), log.stats()
+        finally:
+            await close_db()
+
+    written, stats = asyncio.run(scenario())
+
+    assert written == 600
+    assert stats["pending"] == 0
+
+
+def test_changes_feed(client):
+    project = client.post("/api/projects", json={
+        "title": "Feed", "category": "Дизайн", "status": "В работе", "year": "2024",
+        "image": "/media/feed.jpg", "description": "Audit feed",
+    }).json()
+    client.patch(f"/api/projects/{project['id']}", json={"year": "2025"})
+    client.delete(f"/api/projects/{project['id']}")
+    client.portal.call(audit_log.flush)
+
+    first = client.get("/api/changes", params={"limit": 2}).json()
+    rest = client.get("/api/changes", params={"since": first["next_since"]}).json()
+
+    assert [change["operation"] for change in first["changes"]] == ["create", "update"]
+    assert first["has_more"] is True
+    assert first["changes"][1]["changes"] == {"year": ["2024", "2025"]}
+    assert [change["operation"] for change in rest["changes"]] == ["delete"]
+    assert rest["has_more"] is False
+
+
+@pytest.mark.skipif(not POSTGRES_URL, reason="set TEST_POSTGRES_URL to a scratch PostgreSQL database")
+def test_feed_delivers_batches_committed_out_of_order(monkeypatch):
+    monkeypatch.setattr(settings, "DATABASE_URL", POSTGRES_URL)
+    monkeypatch.setattr(settings, "AUDIT_ENABLED", True)
+    # Tortoise кэширует SQL вставки по имени соединения, а не по диалекту
+    monkeypatch.setattr("tortoise.backends.base.executor.EXECUTOR_CACHE", {})
+    inserted, release = asyncio.Event(), asyncio.Event()
+    executemany = asyncpg.Connection.executemany
+
+    async def held_executemany(self, *args, **kwargs):
+        result = await executemany(self, *args, **kwargs)
+        if not inserted.is_set():
+            # Первый пакет получил id, но его транзакция еще не закоммичена
+            inserted.set()
+            await release.wait()
+        return result
+
+    monkeypatch.setattr(asyncpg.Connection, "executemany", held_executemany)
+
+    async def scenario():
+        await init_db()
+        await Tortoise.generate_schemas(safe=True)
+        try:
+            since = (await get_changes(since=0, limit=1000))["next_since"]
+            while True:
+                page = await get_changes(since=since, limit=1000)
+                since = page["next_since"]
+                if not page["has_more"]:
+                    break
+
+            first, second = AuditLog(flush_interval=60), AuditLog(flush_interval=60)
+            await first.start()
+            await second.start()
+            first.record(-1, ChangeOperation.UPDATE, {"year": ["2023", "2024"]})
+            first_flush = asyncio.create_task(first.flush())
+            await asyncio.wait_for(inserted.wait(), 10)
+            second.record(-2, ChangeOperation.UPDATE, {"year": ["2024", "2025"]})
+            second_flush = asyncio.create_task(second.flush())
+            await asyncio.sleep(0.3)
+
+            # Клиент ленты опрашивает ее, пока первый пакет не закоммичен
+            page = await get_changes(since=since, limit=1000)
+            delivered = [change["project_id"] for change in page["changes"]]
+            release.set()
+            await asyncio.gather(first_flush, second_flush)
+            page = await get_changes(since=page["next_since"], limit=1000)
+            delivered += [change["project_id"] for change in page["changes"]]
+
+            await first.stop()
+            await second.stop()
+            return delivered
+        finally:
+            await close_db()
+
+    assert sorted(asyncio.run(scenario())) == [-2, -1]
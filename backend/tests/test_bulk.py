@@ -0,0 +1,79 @@
+import orjson
+
+import app.main
+from app.seed_data import INITIAL_PROJECTS
+
+
+def ndjson(items):
+    return b"".join(orjson.dumps(item) + b"\n" for item in items)
+
+
+def export(client):
+    response = client.get("/api/projects/export")
+    assert response.status_code == 200
+    return [orjson.loads(line) for line in response.content.splitlines()]
+
+
+def without_updated_at(projects):
+    return [{key: value for key, value in project.items() if key != "updated_at"} for project in projects]
+
+
+def test_bulk_upsert_creates_and_updates_by_id(seeded_client):
+    first = export(seeded_client)[0]
+    projects = [dict(first, title="Обновлен")]
+    projects += [dict(project, title=f"Новый {i}") for i, project in enumerate(INITIAL_PROJECTS[:2])]
+
+    response = seeded_client.post("/api/projects/bulk", json={"projects": projects})
+
+    assert response.status_code == 200, response.text
+    assert response.json() == {"created": 2, "updated": 1, "deleted": 0}
+    titles = [project["title"] for project in export(seeded_client)]
+    assert titles[0] == "Обновлен"
+    assert titles[-2:] == ["Новый 0", "Новый 1"]
+    assert seeded_client.get(f"/api/projects/{first['id']}").json()["title"] == "Обновлен"
+
+
+def test_bulk_delete_counts_only_existing_projects(seeded_client):
+    ids = [project["id"] for project in export(seeded_client)]
+
+    response = seeded_client.post("/api/projects/bulk-delete", json={"ids": ids[:2] + [10**6]})
+
+    assert response.json() == {"created": 0, "updated": 0, "deleted": 2}
+    assert seeded_client.get(f"/api/projects/{ids[0]}").status_code == 404
+    assert [project["id"] for project in export(seeded_client)] == ids[2:]
+
+
+def test_export_then_import_round_trips(seeded_client):
+    exported = export(seeded_client)
+    body = seeded_client.get("/api/projects/export").content
+    seeded_client.post("/api/projects/bulk-delete", json={"ids": [project["id"] for project in exported]})
+
+    response = seeded_client.post("/api/projects/import", content=body)
+
+    assert response.status_code == 200, response.text
+    assert response.json()["created"] == len(exported)
+    assert without_updated_at(export(seeded_client)) == without_updated_at(exported)
+    # Повторный импорт той же выгрузки только обновляет проекты
+    response = seeded_client.post("/api/projects/import", content=body)
+    assert (response.json()["created"], response.json()["updated"]) == (0, len(exported))
+
+
+def test_failed_import_reports_written_batches_and_processes_their_images(client, monkeypatch):
+    processed = []
+
+    async def record(project_ids=None):
+        processed.append(project_ids)
+
+    monkeypatch.setattr(app.main, "BATCH_SIZE", 2)
+    monkeypatch.setattr(app.main, "process_missing_images", record)
+    lines = INITIAL_PROJECTS[:3] + [{"title": "Без категории"}] + INITIAL_PROJECTS[3:]
+
+    response = client.post("/api/projects/import", content=ndjson(lines))
+
+    assert response.status_code == 400
+    body = response.json()
+    # Первый пакет из двух строк записан, третья строка ждала своего пакета
+    assert (body["created"], body["updated"], body["failed_line"]) == (2, 0, 4)
+    assert "line 4" in body["error"]
+    assert client.get("/api/projects").json()["total"] == 2
+    assert len(processed) == 1 and len(processed[0]) == 2
@@ -0,0 +1,91 @@
+import asyncio
+
+from app.cache import TTLCache, catalog_cache
+from app.seed_data import INITIAL_PROJECTS
+
+DESIGN = {"category": "Дизайн"}
+DEVELOPMENT = {"category": "Разработка"}
+
+
+def misses_after(client, path, params=None):
+    """Number of cache misses a GET caused"""
+    before = catalog_cache.misses
+    response = client.get(path, params=params)
+    assert response.status_code == 200, response.text
+    return catalog_cache.misses - before
+
+
+def category_counts(client):
+    return {item["name"]: item["count"] for item in client.get("/api/categories").json()["categories"]}
+
+
+def test_load_started_before_invalidation_is_not_stored():
+    cache = TTLCache()
+
+    async def scenario():
+        started, release = asyncio.Event(), asyncio.Event()
+
+        async def slow_loader():
+            started.set()
+            await release.wait()
+            return "stale"
+
+        loading = asyncio.create_task(cache.get_or_load("key", slow_loader))
+        await started.wait()
+        cache.invalidate("key")
+        release.set()
+        return await loading
+
+    assert asyncio.run(scenario()) == "stale"
+    assert cache.get("key") is None
+
+
+def test_concurrent_misses_share_one_load():
+    for enabled in (True, False):
+        cache = TTLCache(enabled=enabled)
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return calls
+
+        async def scenario():
+            return await asyncio.gather(*(cache.get_or_load("key", loader) for _ in range(10)))
+
+        assert asyncio.run(scenario()) == [1] * 10
+        assert calls == 1
+        assert cache.coalesced == 9
+
+
+def test_update_invalidates_only_affected_lists(seeded_client):
+    client = seeded_client
+    design_id = client.get("/api/projects", params=DESIGN).json()["projects"][0]["id"]
+    for params in (None, DESIGN, DEVELOPMENT):
+        misses_after(client, "/api/projects", params)
+    misses_after(client, "/api/categories")
+
+    # Название не меняет ни категорию, ни счетчики
+    response = client.patch(f"/api/projects/{design_id}", json={"title": "Renamed"})
+    assert response.status_code == 200
+
+    assert misses_after(client, "/api/projects", DEVELOPMENT) == 0
+    assert misses_after(client, "/api/categories") == 0
+    assert misses_after(client, "/api/projects", DESIGN) == 1
+    assert misses_after(client, "/api/projects") == 1
+    assert client.get(f"/api/projects/{design_id}").json()["title"] == "Renamed"
+
+
+def test_create_and_delete_refresh_counts(seeded_client):
+    client = seeded_client
+    counts = category_counts(client)
+
+    created = client.post("/api/projects", json=dict(INITIAL_PROJECTS[0], category="Дизайн")).json()
+    assert misses_after(client, "/api/categories") == 1
+    assert category_counts(client)["Дизайн"] == counts["Дизайн"] + 1
+
+    assert client.delete(f"/api/projects/{created['id']}").status_code == 200
+    assert misses_after(client, "/api/projects", DESIGN) == 1
+    assert category_counts(client) == counts
+    assert client.get(f"/api/projects/{created['id']}").status_code == 404
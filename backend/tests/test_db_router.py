@@ -0,0 +1,43 @@
+import asyncio
+
+import pytest
+
+from app import db_router
+from app.db_router import READ_COOKIE, PrimaryRoutingMiddleware
+
+
+def call(status, method="POST"):
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": status, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": method, "headers": []}
+    asyncio.run(PrimaryRoutingMiddleware(app)(scope, None, send))
+    return dict(messages[0]["headers"]).get(b"set-cookie", b"").decode()
+
+
+@pytest.fixture
+def replicas(monkeypatch):
+    monkeypatch.setattr(db_router, "REPLICAS", ["replica_1"])
+    monkeypatch.setattr(db_router, "_last_write", float("-inf"))
+
+
+@pytest.mark.parametrize("status", [200, 201, 204])
+def test_successful_write_pins_reads_to_primary(replicas, status):
+    assert call(status).startswith(f"{READ_COOKIE}=1")
+    assert db_router._last_write > float("-inf")
+
+
+@pytest.mark.parametrize("status", [400, 404, 422, 429, 500])
+def test_rejected_write_does_not_pin_reads(replicas, status):
+    assert call(status) == ""
+    assert db_router._last_write == float("-inf")
+
+
+def test_read_does_not_pin(replicas):
+    assert call(200, method="GET") == ""
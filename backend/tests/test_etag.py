@@ -0,0 +1,52 @@
+import time
+
+
+def test_if_none_match_gives_304_until_the_list_changes(seeded_client):
+    client = seeded_client
+    first = client.get("/api/projects")
+    etag = first.headers["etag"]
+
+    cached = client.get("/api/projects", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+    assert client.get("/api/projects", headers={"If-None-Match": f'"other", {etag}'}).status_code == 304
+    assert client.get("/api/projects", headers={"If-None-Match": "*"}).status_code == 304
+
+    client.patch("/api/projects/1", json={"title": "Changed"})
+    changed = client.get("/api/projects", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert changed.json()["projects"] != first.json()["projects"]
+
+
+def test_etag_depends_on_the_representation(seeded_client):
+    client = seeded_client
+    etags = {
+        client.get("/api/projects").headers["etag"],
+        client.get("/api/projects", params={"lang": "en"}).headers["etag"],
+        client.get("/api/categories").headers["etag"],
+    }
+    assert len(etags) == 3
+
+
+def test_project_last_modified(seeded_client):
+    client = seeded_client
+    response = client.get("/api/projects/1")
+    last_modified = response.headers["last-modified"]
+
+    assert client.get("/api/projects/1", headers={"If-Modified-Since": last_modified}).status_code == 304
+    # If-None-Match важнее If-Modified-Since
+    stale = client.get("/api/projects/1", headers={"If-None-Match": '"stale"', "If-Modified-Since": last_modified})
+    assert stale.status_code == 200
+
+    time.sleep(1)  # Last-Modified с точностью до секунды
+    client.patch("/api/projects/1", json={"year": "2030"})
+    updated = client.get("/api/projects/1", headers={"If-Modified-Since": last_modified})
+    assert updated.status_code == 200
+    assert updated.json()["year"] == "2030"
+
+
+def test_missing_project_is_not_cached_as_304(client):
+    response = client.get("/api/projects/999", headers={"If-None-Match": "*"})
+    assert response.status_code == 404
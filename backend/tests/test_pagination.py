@@ -0,0 +1,69 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from app.pagination import decode_cursor, encode_cursor
+from app.seed_data import INITIAL_PROJECTS
+
+
+@pytest.fixture
+def catalog(client):
+    # Часть проектов с одинаковым created_at: порядок между ними задает id
+    projects = [
+        dict(INITIAL_PROJECTS[i % len(INITIAL_PROJECTS)], created_at=f"2024-0{1 + i % 3}-01T00:00:00Z")
+        for i in range(12)
+    ]
+    response = client.post("/api/projects/bulk", json={"projects": projects})
+    assert response.status_code == 200, response.text
+    return client
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc)
+    assert decode_cursor(encode_cursor(created_at, 42)) == (created_at, 42)
+
+
+@pytest.mark.parametrize("cursor", ["", "not-base64!", "WzFd", encode_cursor(datetime(2024, 1, 1), 1)[:-3]])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_pages_join_into_the_full_ordered_list(catalog):
+    full = catalog.get("/api/projects").json()
+    expected = [project["id"] for project in full["projects"]]
+    assert full["total"] == 12
+    assert expected == [
+        project["id"]
+        for project in sorted(full["projects"], key=lambda p: (-datetime.fromisoformat(p["created_at"]).timestamp(), p["id"]))
+    ]
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 5, "include_total": "false"}
+        if cursor:
+            params["cursor"] = cursor
+        page = catalog.get("/api/projects", params=params).json()
+        assert page["total"] is None
+        seen += [project["id"] for project in page["projects"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == expected
+
+
+def test_filtered_pages_and_total(catalog):
+    params = {"category": "Разработка", "limit": 2}
+    first = catalog.get("/api/projects", params=params).json()
+    second = catalog.get("/api/projects", params=dict(params, cursor=first["next_cursor"])).json()
+
+    assert first["total"] == second["total"] == 5
+    ids = [project["id"] for project in first["projects"] + second["projects"]]
+    assert len(set(ids)) == 4
+    assert all(project["category"] == "Разработка" for project in first["projects"] + second["projects"])
+
+
+def test_bad_cursor_gives_400(client):
+    response = client.get("/api/projects", params={"cursor": "garbage"})
+    assert response.status_code == 400
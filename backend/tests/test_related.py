@@ -0,0 +1,17 @@
+from app.seed_data import INITIAL_PROJECTS
+
+
+def test_neighbours_follow_list_order_with_tied_created_at(client):
+    older = dict(INITIAL_PROJECTS[0], created_at="2024-01-01T00:00:00Z")
+    tied = [dict(project, created_at="2024-06-01T00:00:00Z") for project in INITIAL_PROJECTS[1:5]]
+    response = client.post("/api/projects/bulk", json={"projects": [older, *tied]})
+    assert response.status_code == 200, response.text
+
+    listed = [project["id"] for project in client.get("/api/projects").json()["projects"]]
+    assert len(listed) == 5
+
+    for i, project_id in enumerate(listed):
+        related = client.get(f"/api/projects/{project_id}/related").json()
+        previous, following = related["previous"], related["next"]
+        assert (previous and previous["id"]) == (listed[i - 1] if i > 0 else None)
+        assert (following and following["id"]) == (listed[i + 1] if i + 1 < len(listed) else None)
@@ -0,0 +1,57 @@
+import pytest
+
+from app.schemas import (
+    LocalizedProjectListResponse,
+    LocalizedProjectResponse,
+    LocalizedProjectSummaryListResponse,
+    LocalizedRelatedProjectsResponse,
+    ProjectListResponse,
+    ProjectResponse,
+    ProjectSummaryListResponse,
+    RelatedProjectsResponse,
+)
+
+
+def declared(client, path):
+    schema = client.get("/openapi.json").json()["paths"][path]["get"]["responses"]["200"]
+    return {ref["$ref"].rsplit("/", 1)[-1] for ref in schema["content"]["application/json"]["schema"]["anyOf"]}
+
+
+def project_id(client):
+    return client.get("/api/projects", params={"limit": 1}).json()["projects"][0]["id"]
+
+
+@pytest.mark.parametrize("params, model", [
+    ({}, ProjectListResponse),
+    ({"view": "summary"}, ProjectSummaryListResponse),
+    ({"lang": "en"}, LocalizedProjectListResponse),
+    ({"lang": "ru", "view": "summary"}, LocalizedProjectSummaryListResponse),
+])
+def test_project_list_matches_a_declared_model(seeded_client, params, model):
+    body = seeded_client.get("/api/projects", params=params).json()
+
+    assert model.__name__ in declared(seeded_client, "/api/projects")
+    # Ответ собирается без валидации: ключи должны совпадать со схемой
+    assert model.model_validate(body).model_dump(mode="json").keys() == body.keys()
+    assert body["projects"][0].keys() == model.model_fields["projects"].annotation.__args__[0].model_fields.keys()
+
+
+@pytest.mark.parametrize("params, model", [({}, ProjectResponse), ({"lang": "en"}, LocalizedProjectResponse)])
+def test_project_matches_a_declared_model(seeded_client, params, model):
+    body = seeded_client.get(f"/api/projects/{project_id(seeded_client)}", params=params).json()
+
+    assert model.__name__ in declared(seeded_client, "/api/projects/{project_id}")
+    assert body.keys() == model.model_fields.keys()
+
+
+@pytest.mark.parametrize("params, model", [
+    ({}, RelatedProjectsResponse),
+    ({"lang": "en"}, LocalizedRelatedProjectsResponse),
+])
+def test_related_matches_a_declared_model(seeded_client, params, model):
+    body = seeded_client.get(f"/api/projects/{project_id(seeded_client)}/related", params=params).json()
+
+    assert model.__name__ in declared(seeded_client, "/api/projects/{project_id}/related")
+    summary_model = model.model_fields["related"].annotation.__args__[0]
+    assert body["related"] and all(item.keys() == summary_model.model_fields.keys() for item in body["related"])
+    model.model_validate(body)
@@ -0,0 +1,56 @@
+from app.search import InvertedIndex
+from app.seed_data import INITIAL_PROJECTS
+
+
+def make_project(client, **fields):
+    response = client.post("/api/projects", json=dict(INITIAL_PROJECTS[0], **fields))
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+def search_ids(client, query, **params):
+    response = client.get("/api/projects/search", params=dict(params, q=query))
+    assert response.status_code == 200, response.text
+    return [project["id"] for project in response.json()["projects"]]
+
+
+def test_index_requires_every_term_and_matches_prefixes():
+    index = InvertedIndex()
+    index.add(1, {"title": "Ребрендинг кофейни", "description": "Дизайн упаковки"})
+    index.add(2, {"title": "Кофейня онлайн", "description": "Разработка сайта"})
+
+    assert sorted(pid for pid, _ in index.search("кофейн")) == [1, 2]
+    assert [pid for pid, _ in index.search("дизайн кофейни")] == [1]
+    assert index.search("дизайн сайта") == []
+    index.remove(1)
+    assert index.search("ребрендинг") == []
+
+
+def test_title_match_ranks_above_description_match(client):
+    in_description = make_project(client, title="Landing", title_en="Landing", description="Сайт для проекта Orbit")
+    in_title = make_project(client, title="Orbit", title_en="Orbit", description="Лендинг")
+
+    assert search_ids(client, "orbit") == [in_title, in_description]
+
+
+def test_search_follows_update_and_delete(client):
+    project_id = make_project(client, title="Aurora", title_en="Aurora")
+    assert search_ids(client, "aurora") == [project_id]
+
+    client.patch(f"/api/projects/{project_id}", json={"title": "Zephyr", "title_en": "Zephyr"})
+    assert search_ids(client, "aurora") == []
+    assert search_ids(client, "zephyr") == [project_id]
+
+    client.delete(f"/api/projects/{project_id}")
+    assert search_ids(client, "zephyr") == []
+
+
+def test_search_pages_and_bulk_writes(client):
+    projects = [dict(INITIAL_PROJECTS[0], title=f"Nebula {i}", title_en=f"Nebula {i}") for i in range(5)]
+    assert client.post("/api/projects/bulk", json={"projects": projects}).status_code == 200
+
+    everything = search_ids(client, "nebula")
+    assert len(everything) == 5
+    assert search_ids(client, "nebula", limit=2, offset=2) == everything[2:4]
+    total = client.get("/api/projects/search", params={"q": "nebula", "limit": 2}).json()["total"]
+    assert total == 5
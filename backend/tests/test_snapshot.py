@@ -0,0 +1,27 @@
+from app.config import settings
+from app.snapshot import SnapshotWriter
+
+
+def test_build_with_rate_limit_enabled(seeded_client, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(settings, "RATE_LIMIT_RATE", 1)
+    writer = SnapshotWriter(str(tmp_path), seeded_client.app)
+
+    # Снимок - больше запросов, чем корзина RATE_LIMIT_BURST одного IP
+    stats = seeded_client.portal.call(writer.build)
+
+    assert stats["written"] > settings.RATE_LIMIT_BURST
+    assert (tmp_path / "api" / "categories.json").is_file()
+
+
+def test_rate_limit_still_applies_to_clients(client, monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(settings, "RATE_LIMIT_RATE", 1)
+    headers = {"X-Real-IP": "203.0.113.7"}
+
+    statuses = [
+        client.get("/api/categories", headers=headers).status_code
+        for _ in range(settings.RATE_LIMIT_BURST + 1)
+    ]
+
+    assert statuses[-1] == 429
@@ -1,6 +1,6 @@
 import { Project } from '../data/projects';
 
-const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
+export const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
 
 export interface ApiResponse<T> {
   data?: T;
@@ -10,6 +10,19 @@ export interface ApiResponse<T> {
 export interface ProjectsListResponse {
   projects: Project[];
   total: number;
+  next_cursor?: string | null;
+}
+
+export type ProjectSummary = Pick<
+  Project,
+  'id' | 'title' | 'title_en' | 'category' | 'category_en' | 'status' | 'status_en' | 'year' | 'image' | 'media'
+>;
+
+export interface RelatedProjectsResponse {
+  id: number;
+  previous: ProjectSummary | null;
+  next: ProjectSummary | null;
+  related: ProjectSummary[];
 }
 
 export interface CategoriesResponse {
@@ -54,6 +67,7 @@ class ApiClient {
     status?: string;
     limit?: number;
     lang?: string;
+    view?: 'summary' | 'full';
   }): Promise<ApiResponse<ProjectsListResponse>> {
     const queryParams = new URLSearchParams();
     
@@ -69,6 +83,9 @@ class ApiClient {
     if (params?.lang) {
       queryParams.append('lang', params.lang);
     }
+    if (params?.view) {
+      queryParams.append('view', params.view);
+    }
     
     const query = queryParams.toString();
     const endpoint = `/api/projects${query ? `?${query}` : ''}`;
@@ -83,6 +100,14 @@ class ApiClient {
     return this.request<Project>(`/api/projects/${id}`);
   }
 
+  /**
+   * Get the neighbouring projects in the list and similar projects
+   */
+  async getRelatedProjects(id: number, limit?: number): Promise<ApiResponse<RelatedProjectsResponse>> {
+    const endpoint = limit ? `/api/projects/${id}/related?limit=${limit}` : `/api/projects/${id}/related`;
+    return this.request<RelatedProjectsResponse>(endpoint);
+  }
+
   /**
    * Get all categories with counts
    */
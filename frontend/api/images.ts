@@ -0,0 +1,23 @@
+import { ImageMeta } from '../data/projects';
+import { API_URL } from './client';
+
+const absolute = (url: string) => (url.startsWith('/') ? `${API_URL}${url}` : url);
+
+/**
+ * Attributes for an <img> processed by the backend: WebP variants in srcset
+ * and the intrinsic size, so the browser reserves space before loading
+ */
+export function responsiveImage(src: string, meta?: ImageMeta, sizes = '100vw') {
+  const webp = meta?.variants.filter((variant) => variant.format === 'webp') ?? [];
+  if (!meta || webp.length === 0) {
+    return { src: absolute(src), width: meta?.width, height: meta?.height };
+  }
+  const largest = webp[webp.length - 1];
+  return {
+    src: absolute(largest.url),
+    srcSet: webp.map((variant) => `${absolute(variant.url)} ${variant.width}w`).join(', '),
+    sizes,
+    width: meta.width,
+    height: meta.height,
+  };
+}
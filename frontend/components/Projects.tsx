@@ -4,6 +4,7 @@ import { Link } from 'react-router-dom';
 import { Category } from '../data/projects';
 import { useProjects } from '../hooks/useProjects';
 import { apiClient } from '../api/client';
+import { responsiveImage } from '../api/images';
 import { useTranslation } from 'react-i18next';
 
 interface CategoryItem {
@@ -17,7 +18,8 @@ const Projects: React.FC = () => {
   const { t, i18n } = useTranslation();
   const [activeCategory, setActiveCategory] = useState<Category>(i18n.language === 'en' ? 'All' : 'Все');
   const { projects: filteredProjects, loading, error } = useProjects({ 
-    category: activeCategory 
+    category: activeCategory,
+    view: 'summary'
   });
   const [categories, setCategories] = useState<CategoryItem[]>([]);
   
@@ -162,7 +164,8 @@ const Projects: React.FC = () => {
             >
               {/* Image */}
               <img 
-                src={project.image} 
+                {...responsiveImage(project.image, project.media?.[project.image], '(min-width: 768px) 50vw, 100vw')}
+                loading="lazy"
                 alt={project.title} 
                 className="w-full h-full object-cover transition-transform duration-700 group-hover:scale-105 opacity-80 group-hover:opacity-60"
               />
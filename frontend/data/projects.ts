@@ -1,5 +1,19 @@
 export type Category = 'Все' | 'Дизайн' | 'Разработка' | 'Стартапы' | 'Другое' | 'All' | 'Design' | 'Development' | 'Startups' | 'Other';
 
+export interface ImageVariant {
+  url: string;
+  width: number;
+  height: number;
+  format: 'webp' | 'avif';
+}
+
+export interface ImageMeta {
+  width: number;
+  height: number;
+  blurhash: string;
+  variants: ImageVariant[];
+}
+
 export interface Project {
   id: number;
   title: string;
@@ -15,6 +29,7 @@ export interface Project {
   images: string[];
   title_en?: string;
   description_en?: string;
+  media?: Record<string, ImageMeta>;
 }
 
 export const projectsData: Project[] = [
@@ -13,6 +13,7 @@ interface UseProjectsParams {
   category?: string;
   status?: string;
   limit?: number;
+  view?: 'summary' | 'full';
 }
 
 /**
@@ -52,7 +53,7 @@ export function useProjects(params?: UseProjectsParams): UseProjectsResult {
     return () => {
       isMounted = false;
     };
-  }, [params?.category, params?.status, params?.limit]);
+  }, [params?.category, params?.status, params?.limit, params?.view]);
 
   return { projects, loading, error, total };
 }
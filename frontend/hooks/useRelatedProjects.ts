@@ -0,0 +1,34 @@
+import { useState, useEffect } from 'react';
+import { apiClient, RelatedProjectsResponse } from '../api/client';
+
+/**
+ * Custom hook for fetching the previous/next and similar projects
+ */
+export function useRelatedProjects(id: number | undefined, limit = 4): RelatedProjectsResponse | null {
+  const [related, setRelated] = useState<RelatedProjectsResponse | null>(null);
+
+  useEffect(() => {
+    setRelated(null);
+    if (!id) {
+      return;
+    }
+
+    let isMounted = true;
+
+    const fetchRelated = async () => {
+      const response = await apiClient.getRelatedProjects(id, limit);
+      // Без соседей страница проекта показывается как обычно
+      if (isMounted && response.data) {
+        setRelated(response.data);
+      }
+    };
+
+    fetchRelated();
+
+    return () => {
+      isMounted = false;
+    };
+  }, [id, limit]);
+
+  return related;
+}
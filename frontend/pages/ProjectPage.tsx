@@ -1,15 +1,18 @@
 import React, { useEffect } from 'react';
 import { useParams, Link } from 'react-router-dom';
-import { ArrowLeft, Loader2 } from 'lucide-react';
+import { ArrowLeft, ArrowRight, Loader2 } from 'lucide-react';
 import Header from '../components/Header';
 import Footer from '../components/Footer';
 import Contact from '../components/Contact';
 import { useProject } from '../hooks/useProject';
+import { useRelatedProjects } from '../hooks/useRelatedProjects';
+import { responsiveImage } from '../api/images';
 import { useTranslation } from 'react-i18next';
 
 const ProjectPage: React.FC = () => {
   const { id } = useParams<{ id: string }>();
   const { project, loading, error } = useProject(id ? Number(id) : undefined);
+  const related = useRelatedProjects(id ? Number(id) : undefined);
   const { t, i18n } = useTranslation();
   
   // Функция для получения локализованного поля
@@ -110,7 +113,7 @@ const ProjectPage: React.FC = () => {
         {/* Main Image */}
         <div className="w-full aspect-video mb-16 overflow-hidden bg-gray-900">
           <img 
-            src={project.image} 
+            {...responsiveImage(project.image, project.media?.[project.image])}
             alt={project.title} 
             className="w-full h-full object-cover"
           />
@@ -172,12 +175,59 @@ const ProjectPage: React.FC = () => {
           <div className="space-y-6 md:space-y-10 mb-24">
              {project.images.map((img, idx) => (
                <div key={idx} className="w-full">
-                 <img src={img} alt={`Detail ${idx}`} className="w-full h-auto grayscale hover:grayscale-0 transition-all duration-700" />
+                 <img {...responsiveImage(img, project.media?.[img])} loading="lazy" alt={`Detail ${idx}`} className="w-full h-auto grayscale hover:grayscale-0 transition-all duration-700" />
                </div>
              ))}
           </div>
         )}
 
+        {/* Related Projects */}
+        {related && related.related.length > 0 && (
+          <div className="mb-24">
+            <h3 className="text-3xl font-bold mb-10">
+              {i18n.language === 'en' ? 'Related Projects' : 'Похожие проекты'}
+            </h3>
+            <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-4 gap-6">
+              {related.related.map((item) => (
+                <Link key={item.id} to={`/project/${item.id}`} className="group block">
+                  <div className="aspect-[4/3] overflow-hidden bg-gray-900 mb-4">
+                    <img
+                      {...responsiveImage(item.image, item.media?.[item.image], '(min-width: 1024px) 25vw, 100vw')}
+                      loading="lazy"
+                      alt={item.title}
+                      className="w-full h-full object-cover grayscale group-hover:grayscale-0 transition-all duration-700"
+                    />
+                  </div>
+                  <p className="text-xs text-gray-500 uppercase tracking-widest mb-1">
+                    {getLocalizedCategory(item)}
+                  </p>
+                  <p className="text-xl font-bold group-hover:text-[#FF4533] transition-colors">
+                    {getLocalizedField(item, 'title')}
+                  </p>
+                </Link>
+              ))}
+            </div>
+          </div>
+        )}
+
+        {/* Previous / Next */}
+        {related && (related.previous || related.next) && (
+          <nav className="flex justify-between gap-6 border-t border-white/20 pt-10">
+            {related.previous ? (
+              <Link to={`/project/${related.previous.id}`} className="group flex items-center gap-3 text-gray-400 hover:text-white transition-colors">
+                <ArrowLeft size={20} className="group-hover:-translate-x-1 transition-transform" />
+                <span className="font-bold uppercase tracking-tight">{getLocalizedField(related.previous, 'title')}</span>
+              </Link>
+            ) : <span />}
+            {related.next ? (
+              <Link to={`/project/${related.next.id}`} className="group flex items-center gap-3 text-gray-400 hover:text-white transition-colors text-right">
+                <span className="font-bold uppercase tracking-tight">{getLocalizedField(related.next, 'title')}</span>
+                <ArrowRight size={20} className="group-hover:translate-x-1 transition-transform" />
+              </Link>
+            ) : <span />}
+          </nav>
+        )}
+
       </main>
 
       <Contact />